@@ -20,8 +20,13 @@ Rules:
 """
 
 import os
+import re
 import sqlite3
 import json
+import functools
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any
 
@@ -30,7 +35,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi import APIRouter
 from typing import List, Literal
 from fastapi import Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, JSONResponse, Response
 import mimetypes
 from pydantic import BaseModel, Field
 from typing import List, Optional, Literal
@@ -39,6 +44,11 @@ from dotenv import load_dotenv
 from fastapi import Header
 import mimetypes
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
 from tools.enrichment.new_pedro_tagger import pedro_enrich_file
 from backend.alias_engine import clusters_as_records
 
@@ -67,8 +77,11 @@ from backend.consolidate_music import analyze_files
 from backend.startup_validation import validate_startup_plan
 from backend.startup_persistence import save_last_run_plan, load_last_run_plan
 from backend.db_state import get_active_db
+from backend.db_connection import get_pool, close_all_pools
+from backend.db_views import prune_alias_pairs
+from backend.file_io import atomic_writer
 
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, BackgroundTasks
 
 from backend.db_state import get_active_db
 
@@ -82,6 +95,7 @@ from backend.config_service import (
     load_config,
     save_config,
     ensure_quarantine_exists,
+    get_atomic_deletions,
 )
 
 
@@ -103,6 +117,7 @@ from backend.paths import (
     APPLY_REPORT_DIR,
     ACTIVE_DB_PATH,
     SCAN_LOCK_PATH,
+    SCAN_JOBS_DIR,
 )
 
 from backend.db_state import set_active_db
@@ -126,14 +141,178 @@ app.add_middleware(
 def utcnow() -> str:
     return datetime.now(timezone.utc).isoformat()
 
+def write_json_file(path: str, payload):
+    """
+    Write `payload` as indented JSON. orjson encodes straight to bytes;
+    stdlib json is the fallback.
+    """
+    if orjson is None:
+        with atomic_writer(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+        return
+
+    with atomic_writer(path) as f:
+        f.write(orjson.dumps(
+            payload,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+        ))
+
+
+def read_json_file(path: str):
+    if orjson is None:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
 def save_last_dry_run_report(report: dict):
     os.makedirs(os.path.dirname(LAST_DRY_RUN_REPORT_PATH), exist_ok=True)
-    with open(LAST_DRY_RUN_REPORT_PATH, "w", encoding="utf-8") as f:
-        json.dump(report, f, indent=2)
+    write_json_file(LAST_DRY_RUN_REPORT_PATH, report)
+
+# Finished job sidecars kept in SCAN_JOBS_DIR; older ones are pruned
+SCAN_JOBS_KEEP = 20
+
+
+def _pid_alive(pid) -> bool:
+    if not isinstance(pid, int) or pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, owned by someone else
+        return True
+    return True
+
+
+def _scan_lock_owner():
+    try:
+        with open(SCAN_LOCK_PATH, "r", encoding="utf-8") as f:
+            return json.load(f).get("pid")
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # Unreadable / half-written lock: no live owner to honour
+        return None
+
+
+def acquire_scan_lock() -> bool:
+    """
+    Atomically create SCAN_LOCK_PATH.
+
+    O_EXCL makes check-and-create a single syscall, so two concurrent
+    run-scan requests can never both win. A lock whose recorded pid is
+    no longer alive (killed server) is removed and acquisition retried once.
+    """
+    for _ in range(2):
+        try:
+            fd = os.open(SCAN_LOCK_PATH, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if _pid_alive(_scan_lock_owner()):
+                return False
+            release_scan_lock()
+            continue
+
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"created_at": utcnow(), "pid": os.getpid()}, f)
+        return True
+
+    return False
+
+
+def release_scan_lock():
+    try:
+        os.remove(SCAN_LOCK_PATH)
+    except Exception:
+        pass
+
+
+def _scan_job_path(job_id: str) -> str:
+    return os.path.join(SCAN_JOBS_DIR, f"{job_id}.json")
+
+
+def save_scan_job(job_id: str, job: dict):
+    # Polled by /startup/scan-status; never expose a half-written file
+    write_json_file(_scan_job_path(job_id), job)
+
+
+def load_scan_job(job_id: str) -> dict | None:
+    # job ids are uuid4 hex; refuse anything that could escape the dir
+    if not job_id.isalnum():
+        return None
+
+    path = _scan_job_path(job_id)
+    if not os.path.exists(path):
+        return None
+
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def recover_scan_jobs(keep: int = SCAN_JOBS_KEEP):
+    """
+    Clean up after a server that died mid-scan.
+
+    - "running" jobs whose owning pid is gone are marked as error
+      (SCAN_INTERRUPTED) so pollers stop waiting on them
+    - a lock held by a dead pid is removed
+    - only the newest `keep` job files are retained
+
+    Runs at startup, before this process can own any scan, so a record
+    carrying our own pid (pid reuse across container restarts) is stale too.
+    """
+    def owner_alive(pid) -> bool:
+        return pid != os.getpid() and _pid_alive(pid)
+
+    if not owner_alive(_scan_lock_owner()):
+        release_scan_lock()
+
+    try:
+        entries = [e for e in os.scandir(SCAN_JOBS_DIR)
+                   if e.is_file() and e.name.endswith(".json")]
+    except FileNotFoundError:
+        return
+
+    entries.sort(key=lambda e: e.stat().st_mtime_ns, reverse=True)
+
+    for entry in entries[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+    for entry in entries[:keep]:
+        job_id = entry.name[:-len(".json")]
+        try:
+            job = load_scan_job(job_id)
+        except Exception:
+            continue
+
+        if not job or job.get("state") != "running" or owner_alive(job.get("pid")):
+            continue
+
+        job.update(
+            state="error",
+            error="SCAN_INTERRUPTED",
+            finished_at=utcnow(),
+        )
+        save_scan_job(job_id, job)
 
 # ---------- PATCH: DB always resolved at runtime ----------
 from backend.db_state import get_active_db
 
+@functools.lru_cache(maxsize=1)
+def _music_lib() -> str | None:
+    """
+    MUSIC_LIB is only read from the environment once per active DB.
+    Cleared whenever the active DB changes.
+    """
+    return os.getenv("MUSIC_LIB")
+
+
 def get_active_db_path() -> str:
     path = get_active_db()
     if not path:
@@ -146,13 +325,73 @@ def get_db():
     if not path:
         raise RuntimeError("NO_ACTIVE_DB")
 
+    with get_pool(path).connection() as conn:
+        conn.row_factory = sqlite3.Row
+        yield conn
+
+# Tables read by the first UI requests (file table, genre side panel)
+WARM_TABLES = ("files", "genres", "file_genres")
+
+
+# Rows sampled per index when PRAGMA optimize re-analyzes
+WARM_ANALYSIS_LIMIT = 400
+
+
+def _has_planner_stats(conn) -> bool:
+    try:
+        return conn.execute("SELECT 1 FROM sqlite_stat1 LIMIT 1").fetchone() is not None
+    except sqlite3.OperationalError:
+        # sqlite_stat1 only exists after the first ANALYZE
+        return False
+
+
+def warm_db(path: str):
+    """
+    Prime SQLite for the first requests after boot.
+
+    - full ANALYZE only when the DB has never been analyzed; otherwise
+      a bounded PRAGMA optimize refreshes whatever statistics drifted
+    - pull the hot tables into the OS page cache
+    - truncate any WAL left behind by a previous process
+
+    Runs on a background thread (see `warm_db_async`).
+    """
     conn = sqlite3.connect(path)
-    conn.row_factory = sqlite3.Row
     try:
-        yield conn
+        if _has_planner_stats(conn):
+            conn.execute(f"PRAGMA analysis_limit={WARM_ANALYSIS_LIMIT}")
+            conn.execute("PRAGMA optimize")
+        else:
+            conn.execute("ANALYZE")
+
+        for table in WARM_TABLES:
+            try:
+                conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
+            except sqlite3.OperationalError:
+                # Older schemas may not have every table yet
+                pass
+
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.commit()
     finally:
         conn.close()
 
+
+def warm_db_async(path: str):
+    """
+    Run `warm_db` off the startup path; requests are served meanwhile.
+
+    Best-effort: a failure here is only logged.
+    """
+    def run():
+        try:
+            warm_db(path)
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not warm active database: {e}")
+
+    threading.Thread(target=run, name="warm-db", daemon=True).start()
+
+
 def deep_merge(original, patch):
     for k, v in patch.items():
         if isinstance(v, dict) and isinstance(original.get(k), dict):
@@ -173,6 +412,45 @@ class FileSummary(BaseModel):
     title: Optional[str]
 
 
+FILE_SUMMARY_COLUMNS = (
+    "id",
+    "original_path",
+    "artist",
+    "album_artist",
+    "album",
+    "title",
+)
+
+def fast_json_response(payload) -> Response:
+    """
+    Encode `payload` with orjson (straight to UTF-8 bytes) when
+    available; stdlib json otherwise.
+    """
+    if orjson is None:
+        return JSONResponse(payload)
+    return Response(
+        content=orjson.dumps(payload),
+        media_type="application/json",
+    )
+
+
+def file_summary_from_row(r) -> FileSummary:
+    """
+    Build a FileSummary from a row selected in model column order
+    (id, original_path, artist, album_artist, album, title).
+
+    Rows come straight from our own DB, so validation is skipped.
+    """
+    return FileSummary.model_construct(
+        id=r[0],
+        original_path=r[1],
+        artist=r[2],
+        album_artist=r[3],
+        album=r[4],
+        title=r[5],
+    )
+
+
 class EnrichmentResult(BaseModel):
     success: bool
     confidence: float
@@ -213,6 +491,7 @@ class StartupRescanPayload(BaseModel):
     db_mode: str = "db-update-only"
     with_fingerprint: bool = False
     search_covers: bool = False
+    no_overwrite: bool = True
 
 
 class InspectSourcePayload(BaseModel):
@@ -281,7 +560,7 @@ class PlanActionsRequest(BaseModel):
 
 # ===================== CONSTANTS =====================
 
-EDITABLE_FIELDS = {
+EDITABLE_FIELDS = frozenset({
     "artist",
     "album_artist",
     "album",
@@ -293,7 +572,19 @@ EDITABLE_FIELDS = {
     "composer",
     "is_compilation",
     "mark_delete",
-}
+})
+
+
+def validate_editable_fields(keys):
+    """
+    Reject any key outside EDITABLE_FIELDS.
+    """
+    invalid = set(keys) - EDITABLE_FIELDS
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"INVALID_FIELDS: {sorted(invalid)}"
+        )
 
 # ===================== STARTUP: VERIFY  CONFIG AND DB =====================
 @app.get("/api/config")
@@ -316,12 +607,36 @@ def patch_config(patch: dict):
     return updated
 
 
+@app.on_event("startup")
+def recover_interrupted_scans():
+    try:
+        recover_scan_jobs()
+    except OSError as e:
+        print(f"⚠️ Could not recover scan jobs: {e}")
+
+
 @app.on_event("startup")
 def verify_db():
     try:
-        get_active_db_path()
+        path = get_active_db_path()
     except RuntimeError:
         print("⚠️ No active music database set. API will reject requests.")
+        return
+
+    if not os.path.exists(path):
+        return
+
+    try:
+        get_pool(path).prime()
+    except sqlite3.Error as e:
+        print(f"⚠️ Could not open active database: {e}")
+
+    warm_db_async(path)
+
+
+@app.on_event("shutdown")
+def close_db_pools():
+    close_all_pools()
 
 # ===================== FILES =====================
 
@@ -330,6 +645,33 @@ from fastapi.responses import StreamingResponse
 import os
 import mimetypes
 
+# Bytes read per iteration while streaming audio
+AUDIO_BLOCK_SIZE = 256 * 1024
+
+
+def iter_file_range(path: str, start: int, length: int):
+    """
+    Yield `length` bytes of `path` from `start` in bounded blocks.
+
+    StreamingResponse pulls each block through the threadpool, so a
+    worker is only held for one read at a time instead of the whole
+    range, and memory stays bounded for open-ended ranges.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            block = f.read(min(AUDIO_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            yield block
+
+
+# Single byte range, RFC 7233: "bytes=start-end", "bytes=start-" or "bytes=-suffix"
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
 @app.get("/audio/{file_id}")
 def stream_audio(
     file_id: int,
@@ -351,17 +693,23 @@ def stream_audio(
 
     path = row["original_path"]
 
-    if not path or not os.path.exists(path):
+    if not path:
+        raise HTTPException(status_code=404, detail="FILE_MISSING_ON_DISK")
+
+    # One stat() serves both the existence check and the size
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="FILE_MISSING_ON_DISK")
 
-    file_size = os.path.getsize(path)
+    file_size = st.st_size
     content_type, _ = mimetypes.guess_type(path)
     content_type = content_type or "audio/mpeg"
 
     # ---------- No Range header ----------
     if range is None:
         return StreamingResponse(
-            open(path, "rb"),
+            iter_file_range(path, 0, file_size),
             media_type=content_type,
             headers={
                 "Accept-Ranges": "bytes",
@@ -370,25 +718,28 @@ def stream_audio(
         )
 
     # ---------- Parse Range header ----------
-    try:
-        units, value = range.split("=")
-        start_str, end_str = value.split("-")
+    m = _RANGE_RE.match(range)
+    if not m:
+        raise HTTPException(status_code=416, detail="INVALID_RANGE")
+
+    start_str, end_str = m.groups()
+
+    if start_str:
         start = int(start_str)
         end = int(end_str) if end_str else file_size - 1
-    except Exception:
+    elif end_str:
+        # Suffix range: "bytes=-N" is the last N bytes
+        start = max(0, file_size - int(end_str))
+        end = file_size - 1
+    else:
         raise HTTPException(status_code=416, detail="INVALID_RANGE")
 
-    if start >= file_size:
+    if start >= file_size or end < start:
         raise HTTPException(status_code=416, detail="RANGE_NOT_SATISFIABLE")
 
     end = min(end, file_size - 1)
     chunk_size = end - start + 1
 
-    def iter_file():
-        with open(path, "rb") as f:
-            f.seek(start)
-            yield f.read(chunk_size)
-
     headers = {
         "Content-Range": f"bytes {start}-{end}/{file_size}",
         "Accept-Ranges": "bytes",
@@ -396,14 +747,79 @@ def stream_audio(
     }
 
     return StreamingResponse(
-        iter_file(),
+        iter_file_range(path, start, chunk_size),
         status_code=206,
         media_type=content_type,
         headers=headers,
     )
 
 
-@app.get("/files", response_model=List[FileSummary])
+# /files filters: (bit order, WHERE clause). Parameters are always
+# bound in this order, so each combination maps to one fixed SQL text.
+LIST_FILES_FILTERS = (
+    "f.artist LIKE ?",
+    "f.album_artist LIKE ?",
+    "f.album LIKE ?",
+    "f.title LIKE ?",
+    "f.mark_delete = ?",
+    "g.name LIKE ?",
+)
+LIST_FILES_GENRE_BIT = 1 << 5
+
+
+def _build_list_files_sql(mask: int) -> str:
+    clauses = [
+        clause
+        for bit, clause in enumerate(LIST_FILES_FILTERS)
+        if mask & (1 << bit)
+    ]
+
+    # ---------- Genre filter (AND-safe) ----------
+    # Joined rather than `id IN (subquery)` so SQLite can drive the
+    # lookup through idx_file_genres_gid_fid.
+    genre_join = ""
+    if mask & LIST_FILES_GENRE_BIT:
+        genre_join = """
+            JOIN file_genres fg ON fg.file_id = f.id
+            JOIN genres g ON g.id = fg.genre_id
+        """
+
+    return f"""
+        SELECT DISTINCT
+            f.id,
+            f.original_path,
+            f.artist,
+            f.album_artist,
+            f.album,
+            f.title
+        FROM files f
+        {genre_join}
+        WHERE {" AND ".join(clauses)}
+        ORDER BY f.id
+        LIMIT ?
+    """
+
+
+# Every filter combination is specialized once at import; identical SQL
+# text per combination keeps SQLite's statement cache hot.
+# Mask 0 (no filter) is refused by the endpoint.
+LIST_FILES_SQL = {
+    mask: _build_list_files_sql(mask)
+    for mask in range(1, 1 << len(LIST_FILES_FILTERS))
+}
+
+
+@app.get(
+    "/files",
+    # Returns pre-encoded JSON; the schema is documented, not enforced
+    response_model=None,
+    response_class=Response,
+    responses={200: {
+        "model": List[FileSummary],
+        "content": {"application/json": {}},
+        "description": "Matching files, FileSummary fields only",
+    }},
+)
 def list_files(
     artist: Optional[str] = Query(None),
     album_artist: Optional[str] = Query(None),
@@ -430,68 +846,40 @@ def list_files(
             detail="At least one filter must be provided to list files"
         )
 
-    clauses = []
-    params = []
-
-    # ---------- Text filters ----------
-    if artist:
-        clauses.append("artist LIKE ?")
-        params.append(f"%{artist}%")
-
-    if album_artist:
-        clauses.append("album_artist LIKE ?")
-        params.append(f"%{album_artist}%")
-
-    if album:
-        clauses.append("album LIKE ?")
-        params.append(f"%{album}%")
-
-    if title:
-        clauses.append("title LIKE ?")
-        params.append(f"%{title}%")
-
-    if mark_delete is not None:
-        clauses.append("mark_delete = ?")
-        params.append(1 if mark_delete else 0)
-
-    # ---------- Genre filter (AND-safe) ----------
-    if genre:
-        clauses.append("""
-            id IN (
-                SELECT fg.file_id
-                FROM file_genres fg
-                JOIN genres g ON fg.genre_id = g.id
-                WHERE g.name LIKE ?
-            )
-        """)
-        params.append(f"%{genre}%")
-
-    where = " AND ".join(clauses)
+    # ---------- Filter values, in LIST_FILES_FILTERS order ----------
+    values = (
+        f"%{artist}%" if artist else None,
+        f"%{album_artist}%" if album_artist else None,
+        f"%{album}%" if album else None,
+        f"%{title}%" if title else None,
+        (1 if mark_delete else 0) if mark_delete is not None else None,
+        f"%{genre}%" if genre else None,
+    )
 
-    sql = f"""
-        SELECT
-            id,
-            original_path,
-            artist,
-            album_artist,
-            album,
-            title
-        FROM files
-        WHERE {where}
-        ORDER BY id
-        LIMIT ?
-    """
+    mask = 0
+    params = []
+    for bit, value in enumerate(values):
+        if value is not None:
+            mask |= 1 << bit
+            params.append(value)
 
     params.append(limit)
 
-    rows = conn.execute(sql, params).fetchall()
+    rows = conn.execute(LIST_FILES_SQL[mask], params).fetchall()
 
-    return [FileSummary(**dict(r)) for r in rows]
+    # Rows already match FileSummary column order; skip pydantic
+    # re-serialization and encode the plain dicts directly.
+    return fast_json_response(
+        [dict(zip(FILE_SUMMARY_COLUMNS, r)) for r in rows]
+    )
 
 # ===================== STARTUP: RUN SCAN =====================
 
 @app.post("/startup/run-scan")
-def startup_run_scan(payload: StartupRunScanPayload):
+def startup_run_scan(
+    payload: StartupRunScanPayload,
+    background_tasks: BackgroundTasks,
+):
     plan = payload.plan
 
     # ---------- Validate plan ----------
@@ -523,7 +911,8 @@ def startup_run_scan(payload: StartupRunScanPayload):
         }
 
     # Activate this DB for the whole process
-    os.environ["MUSIC_DB"] = db_path
+    set_active_db(db_path)
+    _music_lib.cache_clear()
 
 
     # ---------- Resolve core fields ----------
@@ -559,68 +948,34 @@ def startup_run_scan(payload: StartupRunScanPayload):
             "error": "INVALID_DB_MODE",
             "mode": wizard_mode,
         }
-    
-    if os.path.exists(SCAN_LOCK_PATH):
-        return {
-            "status": "error",
-            "error": "SCAN_ALREADY_RUNNING",
-        }
-
-    open(SCAN_LOCK_PATH, "w").close()
-    
-    if dry_run:
-        try:
-            report = analyze_files(
-                src=src,
-                lib=lib,
-                db_path=db_path,
-                progress=False,
-                with_fingerprint=with_fingerprint,
-                search_covers=search_covers,
-                db_mode=run_mode,
-                # dry_run=True,          # 👈 NEW
-            )
-        except Exception as e:
-            try:
-                os.remove(SCAN_LOCK_PATH)
-            except Exception:
-                pass
-
-            return {
-                "status": "error",
-                "error": "DRY_RUN_FAILED",
-                "details": str(e),
-            }
-
-        # Persist report for download
-        try:
-            save_last_run_plan(plan)
-            save_last_dry_run_report(report)   # 👈 new function
-        except Exception:
-            pass
-
-        try:
-            os.remove(SCAN_LOCK_PATH)
-        except Exception:
-            pass
-
-        return {
-            "status": "ok",
-            "mode": "dry-run",
-            "report": report,     # or omit heavy part and expose via endpoint
-        }
 
-    if os.path.exists(SCAN_LOCK_PATH):
+    if not acquire_scan_lock():
         return {
             "status": "error",
             "error": "SCAN_ALREADY_RUNNING",
         }
-    
-    open(SCAN_LOCK_PATH, "w").close()
 
-    # ---------- Run scan ----------
+    # ---------- Run scan off the request thread ----------
+    job_id = uuid.uuid4().hex
+    mode = "dry-run" if dry_run else "real"
+
+    # The lock is only handed to run_scan_job once it is scheduled
     try:
-        analyze_files(
+        save_scan_job(job_id, {
+            "job_id": job_id,
+            "state": "running",
+            "pid": os.getpid(),
+            "mode": mode,
+            "db_path": db_path,
+            "db_mode": run_mode,
+            "started_at": utcnow(),
+        })
+
+        background_tasks.add_task(
+            run_scan_job,
+            job_id,
+            plan,
+            dry_run=dry_run,
             src=src,
             lib=lib,
             db_path=db_path,
@@ -628,37 +983,96 @@ def startup_run_scan(payload: StartupRunScanPayload):
             with_fingerprint=with_fingerprint,
             search_covers=search_covers,
             db_mode=run_mode,
+            no_overwrite=no_overwrite,
         )
-
     except Exception as e:
+        release_scan_lock()
         return {
             "status": "error",
-            "error": "SCAN_FAILED",
+            "error": "SCAN_START_FAILED",
             "details": str(e),
         }
-    finally:
-        try:
-            os.remove(SCAN_LOCK_PATH)
-        except Exception:
-            pass
 
-    # ---------- PATCH: persist last run plan ----------
+    return {
+        "status": "started",
+        "job_id": job_id,
+        "mode": mode,
+        "db_path": db_path,
+        "db_mode": run_mode,
+    }
+
+
+def run_scan_job(job_id: str, plan: dict, dry_run: bool, **scan_kwargs):
+    """
+    Background body of /startup/run-scan.
+
+    Owns SCAN_LOCK_PATH from here on and always releases it.
+    Progress is reported through the job sidecar file.
+    """
+    job = load_scan_job(job_id) or {"job_id": job_id}
+
     try:
-        save_last_run_plan(plan)
-    except Exception as e:
+        try:
+            report = analyze_files(**scan_kwargs)
+        except Exception as e:
+            job.update(
+                state="error",
+                error="DRY_RUN_FAILED" if dry_run else "SCAN_FAILED",
+                details=str(e),
+            )
+            return
+
+        if dry_run:
+            # Persist report for download
+            try:
+                save_last_run_plan(plan)
+                save_last_dry_run_report(report)
+                job["report_path"] = LAST_DRY_RUN_REPORT_PATH
+            except Exception:
+                pass
+        else:
+            # ---------- PATCH: persist last run plan ----------
+            try:
+                save_last_run_plan(plan)
+            except Exception as e:
+                job.update(
+                    state="error",
+                    error="CANNOT_SAVE_LAST_RUN_PLAN",
+                    details=str(e),
+                )
+                return
+
+        job["state"] = "done"
+
+    finally:
+        job["finished_at"] = utcnow()
+        save_scan_job(job_id, job)
+        release_scan_lock()
+
+
+@app.get("/startup/scan-status/{job_id}")
+def startup_scan_status(job_id: str):
+    job = load_scan_job(job_id)
+
+    if not job:
         return {
             "status": "error",
-            "error": "CANNOT_SAVE_LAST_RUN_PLAN",
-            "details": str(e),
+            "error": "SCAN_JOB_NOT_FOUND",
+            "job_id": job_id,
         }
 
-    return {
+    response = {
         "status": "ok",
-        "mode": "real",
-        "db_path": db_path,
-        "db_mode": run_mode,
+        "job": job,
     }
 
+    # Dry-run report is inlined once the job is done
+    report_path = job.get("report_path")
+    if job.get("state") == "done" and report_path and os.path.exists(report_path):
+        response["report"] = read_json_file(report_path)
+
+    return response
+
 
 # ===================== STARTUP: LAST RUN PLAN =====================
 
@@ -685,7 +1099,7 @@ def startup_last_run_plan():
 from typing import Optional
 from fastapi import Query, HTTPException
 
-@app.get("/files/search")
+@app.get("/files/search", response_model=List[FileSummary])
 def search_files(
     q: Optional[str] = Query(None),
     field: str = Query("artist"),
@@ -700,31 +1114,29 @@ def search_files(
     params = []
 
     if q:
-        clauses.append(f"{field} LIKE ?")
+        clauses.append(f"f.{field} LIKE ?")
         params.append(f"%{q}%")
 
     if starts_with:
         if starts_with == "#":
-            clauses.append(f"{field} GLOB '[0-9]*'")
+            clauses.append(f"f.{field} GLOB '[0-9]*'")
         else:
-            clauses.append(f"{field} LIKE ?")
+            clauses.append(f"f.{field} LIKE ?")
             params.append(f"{starts_with}%")
 
     # ---------- GENRE FILTER ----------
+    genre_join = ""
     if genres:
         genre_list = [g.strip() for g in genres.split(",") if g.strip()]
 
         if genre_list:
             placeholders = ",".join("?" for _ in genre_list)
 
-            clauses.append(f"""
-                id IN (
-                    SELECT fg.file_id
-                    FROM file_genres fg
-                    JOIN genres g ON fg.genre_id = g.id
-                    WHERE g.name IN ({placeholders})
-                )
-            """)
+            genre_join = """
+                JOIN file_genres fg ON fg.file_id = f.id
+                JOIN genres g ON g.id = fg.genre_id
+            """
+            clauses.append(f"g.name IN ({placeholders})")
 
             params.extend(genre_list)
 
@@ -733,16 +1145,17 @@ def search_files(
         where_sql = "WHERE " + " AND ".join(clauses)
 
     sql = f"""
-        SELECT
-            id,
-            original_path,
-            artist,
-            album_artist,
-            album,
-            title
-        FROM files
+        SELECT DISTINCT
+            f.id,
+            f.original_path,
+            f.artist,
+            f.album_artist,
+            f.album,
+            f.title
+        FROM files f
+        {genre_join}
         {where_sql}
-        ORDER BY {field} COLLATE NOCASE
+        ORDER BY f.{field} COLLATE NOCASE
         LIMIT ?
     """
 
@@ -751,7 +1164,7 @@ def search_files(
     rows = cur.execute(sql, params).fetchall()
     # conn.close()
 
-    return [dict(r) for r in rows]
+    return [file_summary_from_row(r) for r in rows]
 
 
 # ===================== TAGS & GENRES =====================
@@ -797,12 +1210,7 @@ def update_file(
     if not data:
         return {"status": "ok", "updated": 0}
 
-    invalid = set(data.keys()) - EDITABLE_FIELDS
-    if invalid:
-        raise HTTPException(
-            status_code=400,
-            detail=f"INVALID_FIELDS: {sorted(invalid)}"
-        )
+    validate_editable_fields(data)
 
     fields = []
     params = []
@@ -848,12 +1256,7 @@ def bulk_update_files(
     if not fields_data:
         return {"status": "ok", "updated": 0}
 
-    invalid = set(fields_data.keys()) - EDITABLE_FIELDS
-    if invalid:
-        raise HTTPException(
-            status_code=400,
-            detail=f"INVALID_FIELDS: {sorted(invalid)}"
-        )
+    validate_editable_fields(fields_data)
 
     fields = []
     params = []
@@ -1095,7 +1498,7 @@ def startup_rescan_db(payload: StartupRescanPayload):
 
     # ---------- Resolve library from env ----------
 
-    lib = os.getenv("MUSIC_LIB")
+    lib = _music_lib()
     if not lib:
         return {
             "status": "error",
@@ -1124,6 +1527,7 @@ def startup_rescan_db(payload: StartupRescanPayload):
             with_fingerprint=with_fingerprint,
             search_covers=search_covers,
             db_mode=run_mode,
+            no_overwrite=payload.no_overwrite,
         )
 
     except Exception as e:
@@ -1176,6 +1580,7 @@ def startup_set_database(payload: StartupActivatePayload):
 
     # ✅ Persist active database (cross-process, cross-platform)
     set_active_db(db_path)
+    _music_lib.cache_clear()
 
     return {
         "status": "ok",
@@ -1295,8 +1700,7 @@ def startup_last_dry_run_report():
     if not os.path.exists(LAST_DRY_RUN_REPORT_PATH):
         return {"status": "none"}
 
-    with open(LAST_DRY_RUN_REPORT_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    data = read_json_file(LAST_DRY_RUN_REPORT_PATH)
 
     return {
         "status": "ok",
@@ -1306,6 +1710,7 @@ def startup_last_dry_run_report():
 @app.post("/startup/apply", response_model=ApplyRunReport)
 def startup_apply(
     payload: ApplyRunPayload,
+    background_tasks: BackgroundTasks,
     conn: sqlite3.Connection = Depends(get_db),
 ):
     started_at = utcnow()
@@ -1336,7 +1741,7 @@ def startup_apply(
         # Build skipped plan
         files = []
         for row in candidates:
-            files.append(ApplyFileResult(
+            files.append(ApplyFileResult.model_construct(
                 file_id=row["id"],
                 original_path=row["original_path"],
                 planned_action="delete",
@@ -1344,7 +1749,7 @@ def startup_apply(
                 error="MAX_DELETE_EXCEEDED",
             ))
 
-        summary = ApplyRunSummary(
+        summary = ApplyRunSummary.model_construct(
             total_candidates=total_candidates,
             delete_planned_count=total_candidates,
             delete_success_count=0,
@@ -1354,7 +1759,7 @@ def startup_apply(
 
         finished_at = utcnow()
 
-        report = ApplyRunReport(
+        report = ApplyRunReport.model_construct(
             run_id=run_id,
             started_at=started_at,
             finished_at=finished_at,
@@ -1365,7 +1770,8 @@ def startup_apply(
             files=files,
         )
 
-        save_apply_report(report)
+        # Persisted after the response is sent
+        background_tasks.add_task(save_apply_report, report)
         return report
 
     # ---------- Phase 3: Build plan ----------
@@ -1373,7 +1779,7 @@ def startup_apply(
 
     # ---------- Phase 4: Dry-run ----------
     if payload.dry_run:
-        summary = ApplyRunSummary(
+        summary = ApplyRunSummary.model_construct(
             total_candidates=total_candidates,
             delete_planned_count=total_candidates,
             delete_success_count=0,
@@ -1383,7 +1789,7 @@ def startup_apply(
 
         finished_at = utcnow()
 
-        report = ApplyRunReport(
+        report = ApplyRunReport.model_construct(
             run_id=run_id,
             started_at=started_at,
             finished_at=finished_at,
@@ -1394,7 +1800,8 @@ def startup_apply(
             files=plan,
         )
 
-        save_apply_report(report)
+        # Persisted after the response is sent
+        background_tasks.add_task(save_apply_report, report)
         return report
 
     # ---------- Phase 5: Real apply ----------
@@ -1405,7 +1812,7 @@ def startup_apply(
     failed = sum(1 for f in plan if f.status == "failed")
     skipped = sum(1 for f in plan if f.status == "skipped")
 
-    summary = ApplyRunSummary(
+    summary = ApplyRunSummary.model_construct(
         total_candidates=total_candidates,
         delete_planned_count=total_candidates,
         delete_success_count=success,
@@ -1415,7 +1822,7 @@ def startup_apply(
 
     finished_at = utcnow()
 
-    report = ApplyRunReport(
+    report = ApplyRunReport.model_construct(
         run_id=run_id,
         started_at=started_at,
         finished_at=finished_at,
@@ -1426,7 +1833,8 @@ def startup_apply(
         files=plan,
     )
 
-    save_apply_report(report)
+    # Persisted after the response is sent
+    background_tasks.add_task(save_apply_report, report)
     return report
 # ===================== START =====================
 
@@ -1442,8 +1850,9 @@ def select_delete_candidates(conn) -> List[sqlite3.Row]:
 def build_apply_plan(candidates: List[sqlite3.Row]) -> List[ApplyFileResult]:
     plan: List[ApplyFileResult] = []
 
+    # Rows come straight from SQL; skip per-field validation
     for row in candidates:
-        plan.append(ApplyFileResult(
+        plan.append(ApplyFileResult.model_construct(
             file_id=row["id"],
             original_path=row["original_path"],
             planned_action="delete",
@@ -1482,18 +1891,124 @@ def plan_actions(req: PlanActionsRequest):
         "delete_mode": req.delete_mode,
     }
 
-def apply_deletions(conn, plan: List[ApplyFileResult]):
-    cur = conn.cursor()
+# Parent directories unlinked concurrently during apply
+UNLINK_WORKERS = 8
 
+
+def _unlink_group(parent: str, items: List[ApplyFileResult]):
+    """
+    Unlink files sharing one parent directory, opening it once.
+
+    Removing by basename relative to a directory fd skips the kernel's
+    full path walk per file. Falls back to plain os.remove where dir_fd
+    is unsupported (e.g. Windows).
+
+    Returns [(item, OSError | None)]. A file (or parent) that is already
+    gone counts as removed.
+    """
+    results = []
+
+    if os.unlink not in os.supports_dir_fd:
+        for item in items:
+            try:
+                os.remove(item.original_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                results.append((item, e))
+                continue
+            results.append((item, None))
+        return results
+
+    try:
+        dir_fd = os.open(parent or ".", os.O_RDONLY | os.O_DIRECTORY)
+    except FileNotFoundError:
+        return [(item, None) for item in items]
+    except OSError as e:
+        return [(item, e) for item in items]
+
+    try:
+        for item in items:
+            try:
+                os.unlink(os.path.basename(item.original_path), dir_fd=dir_fd)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                results.append((item, e))
+                continue
+            results.append((item, None))
+    finally:
+        os.close(dir_fd)
+
+    return results
+
+
+def _unlink_grouped_by_parent(plan: List[ApplyFileResult]):
+    """
+    Unlink plan files, one worker thread per parent directory.
+
+    unlink() releases the GIL while it waits on filesystem metadata, so
+    directories are processed in parallel; files within one directory stay
+    sequential since they contend on the same directory lock. Results are
+    yielded on the caller's thread, which keeps SQLite single-threaded.
+    """
+    by_parent: Dict[str, List[ApplyFileResult]] = {}
     for item in plan:
-        try:
-            os.remove(item.original_path)
-            cur.execute("DELETE FROM files WHERE id = ?", (item.file_id,))
-            item.status = "deleted"
-        except Exception as e:
+        parent, _ = os.path.split(item.original_path)
+        by_parent.setdefault(parent, []).append(item)
+
+    if len(by_parent) <= 1:
+        for parent, items in by_parent.items():
+            yield from _unlink_group(parent, items)
+        return
+
+    workers = min(UNLINK_WORKERS, len(by_parent))
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for results in ex.map(_unlink_group, by_parent.keys(), by_parent.values()):
+            yield from results
+
+
+# Rows deleted (and committed) per batch. Also bounds the IN (...) list
+# below SQLite's default SQLITE_MAX_VARIABLE_NUMBER (999).
+DELETE_CHUNK_SIZE = 500
+
+
+def apply_deletions(conn, plan: List[ApplyFileResult], atomic: Optional[bool] = None):
+    """
+    Unlink planned files and drop their rows.
+
+    Unless `atomic` (default: config apply.atomic_deletions), rows are
+    committed every DELETE_CHUNK_SIZE deletions so read endpoints are not
+    locked out for the whole filesystem pass.
+    """
+    if atomic is None:
+        atomic = get_atomic_deletions()
+
+    cur = conn.cursor()
+    pending_ids: List[int] = []
+
+    def flush():
+        if pending_ids:
+            placeholders = ",".join("?" * len(pending_ids))
+            cur.execute(f"DELETE FROM files WHERE id IN ({placeholders})", pending_ids)
+            prune_alias_pairs(cur, pending_ids)
+            pending_ids.clear()
+        if not atomic:
+            conn.commit()
+
+    for item, err in _unlink_grouped_by_parent(plan):
+        if err is not None:
             item.status = "failed"
-            item.error = str(e)
+            item.error = f"{err.errno}:{err.strerror}"
+            continue
+
+        item.status = "deleted"
+        pending_ids.append(item.file_id)
 
+        if len(pending_ids) >= DELETE_CHUNK_SIZE:
+            flush()
+
+    flush()
     conn.commit()
 
 def save_apply_report(report: ApplyRunReport) -> str:
@@ -1503,8 +2018,28 @@ def save_apply_report(report: ApplyRunReport) -> str:
     filename = f"apply_report_{ts}.json"
     path = os.path.join(APPLY_REPORT_DIR, filename)
 
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(report.dict(), f, indent=2)
+    # Models are encoded straight from their field storage (vars), so
+    # no per-item model_dump() dict is built.
+    if orjson is not None:
+        dumps = functools.partial(orjson.dumps, default=vars)
+    else:
+        dumps = lambda obj: json.dumps(obj, default=vars).encode("utf-8")
+
+    # Stream field by field: the files list can be huge, so it is never
+    # materialized as one nested dict (report.dict()) before encoding.
+    with atomic_writer(path) as f:
+        f.write(b"{\n")
+        for key, value in vars(report).items():
+            if key != "files":
+                f.write(b'  "%s": %s,\n' % (key.encode("utf-8"), dumps(value)))
+
+        f.write(b'  "files": [')
+        sep = b"\n    "
+        for item in report.files:
+            f.write(sep)
+            f.write(dumps(item))
+            sep = b",\n    "
+        f.write(b"\n  ]\n}\n" if report.files else b"]\n}\n")
 
     return path
 
@@ -2,16 +2,29 @@ import json
 import os
 from backend.paths import ACTIVE_DB_PATH
 
+# Last parsed ACTIVE_DB_PATH, keyed by its stat signature
+_cache = {"sig": None, "value": None}
+
 def set_active_db(db_path: str):
     os.makedirs(os.path.dirname(ACTIVE_DB_PATH), exist_ok=True)
     with open(ACTIVE_DB_PATH, "w", encoding="utf-8") as f:
         json.dump({"db_path": db_path}, f)
+    _cache["sig"] = None
 
 def get_active_db():
-    if not os.path.exists(ACTIVE_DB_PATH):
+    try:
+        st = os.stat(ACTIVE_DB_PATH)
+    except FileNotFoundError:
         return None
 
+    sig = (st.st_mtime_ns, st.st_size)
+    if sig == _cache["sig"]:
+        return _cache["value"]
+
     with open(ACTIVE_DB_PATH, "r", encoding="utf-8") as f:
         data = json.load(f)
 
-    return data.get("db_path")
+    value = data.get("db_path")
+    _cache["value"] = value
+    _cache["sig"] = sig
+    return value
@@ -13,154 +13,103 @@ Purpose:
 This module is:
 - Deterministic
 - Side-effect free
-- DB read-only
+- DB read-only (cluster membership goes to a temp table)
 """
 
 import sqlite3
-from typing import Dict, List, Set, Any
-from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, List, Any
+
+from backend.cluster_service import build_duplicate_clusters
 
 
 # ============================================================
-# Low-level graph construction
+# Cluster membership (temp table)
 # ============================================================
 
-def build_alias_graph(conn: sqlite3.Connection) -> Dict[int, Set[int]]:
+def load_cluster_map(
+    conn: sqlite3.Connection,
+    clusters: Dict[int, List[int]],
+) -> None:
     """
-    Build an undirected graph from strong alias edges.
+    Materialize {cluster_id: [file_id, ...]} into temp.cluster_map so
+    per-cluster lookups become single joined queries.
 
-    Returns:
-        { file_id: {other_file_id, ...}, ... }
+    Lives in the connection's temp schema; the main DB is not written.
     """
-    rows = conn.execute(
-        """
-        SELECT file_id, other_file_id
-        FROM alias_strong_edges
-        """
-    ).fetchall()
-
-    graph: Dict[int, Set[int]] = defaultdict(set)
-
-    for a, b in rows:
-        graph[a].add(b)
-        graph[b].add(a)
-
-    return graph
-
-
-def connected_components(graph: Dict[int, Set[int]]) -> List[Set[int]]:
-    """
-    Compute connected components of an undirected graph.
-    """
-    visited: Set[int] = set()
-    clusters: List[Set[int]] = []
-
-    for node in graph:
-        if node in visited:
-            continue
-
-        stack = [node]
-        component = set()
-
-        while stack:
-            cur = stack.pop()
-            if cur in visited:
-                continue
-
-            visited.add(cur)
-            component.add(cur)
-            stack.extend(graph.get(cur, []))
-
-        clusters.append(component)
-
-    return clusters
+    conn.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS cluster_map (
+            file_id INTEGER PRIMARY KEY,
+            cluster_id INTEGER NOT NULL
+        )
+    """)
+    conn.execute("DELETE FROM temp.cluster_map")
+    conn.executemany(
+        "INSERT INTO temp.cluster_map (file_id, cluster_id) VALUES (?, ?)",
+        (
+            (file_id, cluster_id)
+            for cluster_id, members in clusters.items()
+            for file_id in members
+        ),
+    )
 
 
 # ============================================================
 # Signal aggregation
 # ============================================================
 
-def aggregate_signals(
-    conn: sqlite3.Connection,
-    cluster: set[int],
-) -> dict[str, int]:
+def aggregate_signals(conn: sqlite3.Connection) -> Dict[int, Dict[str, int]]:
     """
-    Count how many alias signals contributed inside a cluster.
+    Count how many alias signals contributed inside each mapped cluster.
 
     Returns:
         {
-            "sha256": 12,
-            "fingerprint": 8,
-            "artist_title": 31,
-            "album_title": 19
+            cluster_id: {
+                "sha256": 12,
+                "fingerprint": 8,
+                "artist_title": 31,
+                "album_title": 19
+            },
+            ...
         }
     """
-    if len(cluster) < 2:
-        return {}
-
-    placeholders = ",".join("?" for _ in cluster)
-
     rows = conn.execute(
-        f"""
+        """
         SELECT
-            signal_type,
+            cma.cluster_id,
+            ap.signal_type,
             COUNT(*) AS count
-        FROM alias_pairs_all
-        WHERE
-            file_id IN ({placeholders})
-            AND other_file_id IN ({placeholders})
-        GROUP BY signal_type
-        """,
-        tuple(cluster) * 2,
+        FROM alias_pairs_all ap
+        JOIN temp.cluster_map cma ON cma.file_id = ap.file_id
+        JOIN temp.cluster_map cmb
+             ON cmb.file_id = ap.other_file_id
+            AND cmb.cluster_id = cma.cluster_id
+        GROUP BY cma.cluster_id, ap.signal_type
+        """
     ).fetchall()
 
-    return {row["signal_type"]: row["count"] for row in rows}
+    signals: Dict[int, Dict[str, int]] = {}
+    for cluster_id, signal_type, count in rows:
+        signals.setdefault(cluster_id, {})[signal_type] = count
 
+    return signals
 
 
 # ============================================================
 # Canonical candidate selection
 # ============================================================
 
-def choose_canonical_candidate(
-    conn: sqlite3.Connection,
-    cluster: Set[int],
-    signals: Dict[str, int],
-) -> int:
+def canonical_rank(meta_score: int, path_len: int, file_id: int):
     """
-    Deterministically select the canonical file for a cluster.
+    Sort key for the canonical file of a cluster (lowest wins).
 
     Priority:
     1. Most metadata present
     2. Shortest normalized path
     3. Lowest file_id (stable tie-break)
     """
-    placeholders = ",".join("?" for _ in cluster)
-
-    rows = conn.execute(
-        f"""
-        SELECT
-            id,
-            artist,
-            album,
-            title,
-            LENGTH(original_path) AS path_len
-        FROM files
-        WHERE id IN ({placeholders})
-        """,
-        tuple(cluster),
-    ).fetchall()
-
-    def score(row):
-        meta_score = sum(1 for k in ("artist", "album", "title") if row[k])
-        return (
-            -meta_score,          # more metadata is better
-            row["path_len"],      # shorter path preferred
-            row["id"],            # stable tie-break
-        )
-
-    best = sorted(rows, key=score)[0]
-    return best["id"]
+    return (-meta_score, path_len, file_id)
 
 
 # ============================================================
@@ -222,41 +171,74 @@ def clusters_as_records(
     - confidence
     - canonical candidate
     """
-    graph = build_alias_graph(conn)
-    raw_clusters = connected_components(graph)
+    # Union-find over alias_strong_edges; clusters come back keyed by
+    # their smallest file id, so cluster_id order is stable across runs.
+    raw_clusters = build_duplicate_clusters(conn).values()
+
+    clusters = {
+        idx: members
+        for idx, members in enumerate(raw_clusters, start=1)
+        if len(members) >= min_size
+    }
+    if not clusters:
+        return []
+
+    load_cluster_map(conn, clusters)
+
+    try:
+        signals_by_cluster = aggregate_signals(conn)
+
+        # One ordered pass over member files: each row feeds both the
+        # canonical ranking and the file list of its cluster.
+        rows = conn.execute(
+            """
+            SELECT
+                cm.cluster_id,
+                f.id,
+                f.artist,
+                f.album,
+                f.title,
+                f.original_path,
+                (COALESCE(f.artist, '') != '')
+                    + (COALESCE(f.album, '') != '')
+                    + (COALESCE(f.title, '') != '') AS meta_score,
+                LENGTH(f.original_path) AS path_len
+            FROM temp.cluster_map cm
+            JOIN files f ON f.id = cm.file_id
+            ORDER BY cm.cluster_id, f.id
+            """
+        ).fetchall()
+    finally:
+        conn.execute("DROP TABLE IF EXISTS temp.cluster_map")
 
     results: List[Dict[str, Any]] = []
 
-    for idx, cluster in enumerate(raw_clusters, start=1):
-        if len(cluster) < min_size:
-            continue
+    for idx, group in groupby(rows, key=itemgetter(0)):
+        files = []
+        best = None
 
-        signals = aggregate_signals(conn, cluster)
-        confidence = compute_confidence(len(cluster), signals)
-        canonical_id = choose_canonical_candidate(conn, cluster, signals)
+        for _, file_id, artist, album, title, path, meta_score, path_len in group:
+            files.append({
+                "id": file_id,
+                "artist": artist,
+                "album": album,
+                "title": title,
+                "original_path": path,
+            })
 
-        placeholders = ",".join("?" for _ in cluster)
-        files = conn.execute(
-            f"""
-            SELECT
-                id,
-                artist,
-                album,
-                title,
-                original_path
-            FROM files
-            WHERE id IN ({placeholders})
-            ORDER BY id
-            """,
-            tuple(cluster),
-        ).fetchall()
+            rank = canonical_rank(meta_score, path_len, file_id)
+            if best is None or rank < best:
+                best = rank
+
+        size = len(clusters[idx])
+        signals = signals_by_cluster.get(idx, {})
 
         results.append({
             "cluster_id": idx,
-            "size": len(cluster),
-            "confidence": confidence,
+            "size": size,
+            "confidence": compute_confidence(size, signals),
             "signals": signals,
-            "canonical_candidate_id": canonical_id,
+            "canonical_candidate_id": best[2],
 
             # ---- inert metadata (future use) ----
             "resolution_status": "unresolved",
@@ -264,7 +246,7 @@ def clusters_as_records(
             "notes": None,
             "cluster_tags": [],
 
-            "files": [dict(r) for r in files],
+            "files": files,
         })
 
     return results
@@ -2,6 +2,7 @@ from backend.lock_service import acquire_lock, release_lock
 from backend.config_service import load_config, ensure_quarantine_exists
 from backend.active_db import get_active_db
 from backend.execute_actions import execute_actions
+from backend.db_connection import get_pool
 from pathlib import Path
 import sqlite3
 import sys
@@ -58,9 +59,8 @@ def apply_actions(
                 "PERMANENT_DELETE_REQUIRES_CONFIRMATION"
             )
         if permanent_delete:
-            conn = sqlite3.connect(db_path)
-
-            delete_count = count_permanent_deletes(conn)
+            with get_pool(db_path).connection() as conn:
+                delete_count = count_permanent_deletes(conn)
 
             if delete_count > 0 and not confirm_permanent:
                 print()
@@ -76,8 +76,6 @@ def apply_actions(
                     print("Aborted.")
                     return {"aborted": True}
 
-            conn.close()
-
         # Ensure DB schema is up to date (no scanning, no filesystem changes)
         analyze_files(
             src=None,
@@ -89,20 +87,16 @@ def apply_actions(
         # Flip delete intent at the DB level (never during dry-run)
         if permanent_delete and not dry_run:
             try:
-                conn = sqlite3.connect(db_path)
+                with get_pool(db_path).write() as conn:
+                    conn.execute("""
+                        UPDATE files
+                        SET delete_mode='permanent'
+                        WHERE action='delete'
+                          AND lifecycle_state NOT IN ('applied','locked')
+                    """)
+                    conn.commit()
             except sqlite3.Error as e:
                 raise RuntimeError(f"DB_CONNECTION_FAILED: {e}")
-            try:
-                c = conn.cursor()
-                c.execute("""
-                    UPDATE files
-                    SET delete_mode='permanent'
-                    WHERE action='delete'
-                      AND lifecycle_state NOT IN ('applied','locked')
-                """)
-                conn.commit()
-            finally:
-                conn.close()
         
         summary = execute_actions(
             db_path=db_path,
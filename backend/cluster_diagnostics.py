@@ -14,6 +14,7 @@ No DB writes.
 
 from __future__ import annotations
 from collections import Counter
+import heapq
 from typing import Dict, Any
 import sqlite3
 
@@ -56,11 +57,12 @@ def compute_cluster_stats(conn: sqlite3.Connection) -> Dict[str, Any]:
 
 def get_largest_clusters(conn: sqlite3.Connection, top_n: int = 10):
     clusters = build_duplicate_clusters(conn)
-    sorted_clusters = sorted(
+    # Partial selection: O(n log top_n) instead of sorting every cluster
+    return heapq.nsmallest(
+        top_n,
         clusters.values(),
         key=lambda c: (-len(c), c[0])  # deterministic ordering
     )
-    return sorted_clusters[:top_n]
 
 
 def find_suspicious_clusters(conn: sqlite3.Connection, min_size: int = 10):
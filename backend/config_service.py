@@ -18,8 +18,16 @@ Design goals:
 """
 
 from pathlib import Path
+import copy
 import json
 
+from backend.file_io import atomic_writer
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
 # --------------------------------------------------
 # PATHS
 # --------------------------------------------------
@@ -43,6 +51,10 @@ DEFAULT_CONFIG = {
     },
     "paths": {
         "quarantine_path": "~/PedroQuarantine"
+    },
+    "apply": {
+        # True → one transaction for the whole deletion run
+        "atomic_deletions": False
     }
 }
 
@@ -74,24 +86,45 @@ def _deep_merge(default: dict, user: dict) -> dict:
 # PUBLIC API
 # --------------------------------------------------
 
-def load_config() -> dict:
-    """
-    Load config.json safely.
+# Merged config keyed by config.json's stat signature (mtime, size)
+_cache = {"sig": None, "value": None}
 
-    If missing → create default automatically.
-    If partially missing → merge with defaults.
-    """
 
-    if not CONFIG_PATH.exists():
+def _cached_config() -> dict:
+    """
+    Shared, read-only view of the merged config.
+    Re-parses config.json only when it changed on disk.
+    """
+    try:
+        st = CONFIG_PATH.stat()
+    except FileNotFoundError:
         save_config(DEFAULT_CONFIG)
         return DEFAULT_CONFIG
 
+    sig = (st.st_mtime_ns, st.st_size)
+    if sig == _cache["sig"]:
+        return _cache["value"]
+
     try:
         user_cfg = json.loads(CONFIG_PATH.read_text(encoding="utf-8"))
     except Exception as e:
         raise RuntimeError(f"CONFIG_INVALID: {e}")
 
-    return _deep_merge(DEFAULT_CONFIG, user_cfg)
+    _cache["value"] = _deep_merge(DEFAULT_CONFIG, user_cfg)
+    _cache["sig"] = sig
+    return _cache["value"]
+
+
+def load_config() -> dict:
+    """
+    Load config.json safely.
+
+    If missing → create default automatically.
+    If partially missing → merge with defaults.
+
+    Returns a private copy; callers may mutate it.
+    """
+    return copy.deepcopy(_cached_config())
 
 
 def save_config(cfg: dict):
@@ -99,10 +132,16 @@ def save_config(cfg: dict):
     Persist config safely.
     """
     CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    CONFIG_PATH.write_text(
-        json.dumps(cfg, indent=2, ensure_ascii=False),
-        encoding="utf-8"
-    )
+
+    if orjson is None:
+        payload = json.dumps(cfg, indent=2, ensure_ascii=False).encode("utf-8")
+    else:
+        payload = orjson.dumps(cfg, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+    with atomic_writer(CONFIG_PATH) as f:
+        f.write(payload)
+
+    _cache["sig"] = None
 
 
 def get_config_path():
@@ -113,14 +152,18 @@ def get_config_path():
 # --------------------------------------------------
 
 def get_language() -> str:
-    return load_config()["language"]
+    return _cached_config()["language"]
 
 
 def get_quarantine_path() -> Path:
-    path = load_config()["paths"]["quarantine_path"]
+    path = _cached_config()["paths"]["quarantine_path"]
     return Path(path).expanduser().resolve()
 
 
+def get_atomic_deletions() -> bool:
+    return bool(_cached_config()["apply"]["atomic_deletions"])
+
+
 def ensure_quarantine_exists() -> Path:
     """
     Guarantees quarantine directory exists.
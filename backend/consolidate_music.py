@@ -34,21 +34,37 @@ consume the DB created/updated by this module.
 """
 
 import os
+import json
+import functools
 import sqlite3
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from collections import deque
+from contextlib import contextmanager
 import hashlib
 import subprocess
-import re
 import unicodedata
 import logging
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
 
 from mutagen import File as MutagenFile
+from mutagen import MutagenError
+from mutagen.mp4 import MP4
 from dotenv import load_dotenv
-from backend.normalization import normalize_text
+from backend.normalization import normalize_text, combining_marks_table
 from backend.db_migrations import run_migrations
+from backend.db_connection import open_ingest_db
+from backend.file_io import atomic_writer
+from backend.db_views import ensure_alias_pairs_table, refresh_alias_pairs
+from backend.db_schema_helpers import ensure_files_lookup_indexes, table_columns
 from backend.scan_finalize import finalize_scan
-from backend.container_detection import detect_container_from_header
+from backend.container_detection import (
+    HEADER_SIZE,
+    detect_container,
+    detect_container_from_header,
+)
 
 try:
     from tqdm import tqdm
@@ -78,8 +94,16 @@ COMMON_COVER_NAMES = {"cover", "folder", "front", "album", "albumart"}
 
 ENABLE_CHROMAPRINT = True
 FP_SECONDS = 90
+# PCM bytes handed to Chromaprint per feed() while ffmpeg keeps decoding
+FP_CHUNK_SIZE = 64 * 1024
 DATABASES_DIR = Path("databases")
 
+# Characters not allowed in file/directory names (Windows set + controls),
+# each mapped to "_" in a single str.translate pass
+_FS_BAD = str.maketrans(
+    dict.fromkeys('<>:"/\\|?*' + "".join(map(chr, range(0x20))), "_")
+)
+
 
 load_dotenv()
 
@@ -92,34 +116,66 @@ logging.basicConfig(
 
 # ================= ENV HELPERS =================
 
+ENV_FILE = ".env"
+
+# Parsed `.env` lines, keyed on the file's (mtime_ns, size)
+_env_cache = {"sig": None, "lines": []}
+
+
+def _env_signature():
+    try:
+        st = os.stat(ENV_FILE)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _env_lines():
+    sig = _env_signature()
+    if sig is None:
+        return []
+
+    if sig != _env_cache["sig"]:
+        with open(ENV_FILE, "r") as f:
+            _env_cache["lines"] = f.readlines()
+        _env_cache["sig"] = sig
+
+    return _env_cache["lines"]
+
+
 def _update_env(key, value):
     """
     Persist a single key=value pair into a local `.env` file.
 
     Behavior:
-    - If `.env` exists, load existing lines and drop any previous
-      occurrences of `key`.
-    - Append the new `key=value` pair and write the file back.
+    - If `.env` exists, load existing lines (cached until the file
+      changes) and drop any previous occurrences of `key`.
+    - Append the new `key=value` pair and write the file back
+      atomically. Nothing is written when `key` already holds `value`.
 
     Note: this is a convenience helper to make CLI usage remember the
     chosen DB/library paths between runs. It is intentionally simple —
     not a replacement for a full configuration management solution.
     """
 
-    lines = []
-    if os.path.exists(".env"):
-        with open(".env", "r") as f:
-            lines = f.readlines()
+    entry = f"{key}={value}\n"
+    lines = _env_lines()
+
+    if [l for l in lines if l.startswith(f"{key}=")] == [entry]:
+        return
 
     # Remove any existing line that sets this key, then append the
     # new one. Writing the whole file is simpler and avoids partial
     # update complexity.
     lines = [l for l in lines if not l.startswith(f"{key}=")]
-    lines.append(f"{key}={value}\n")
+    lines.append(entry)
 
-    with open(".env", "w") as f:
+    with atomic_writer(ENV_FILE, "w") as f:
         f.writelines(lines)
 
+    _env_cache["lines"] = lines
+    _env_cache["sig"] = _env_signature()
+
 
 def resolve_env_path(key, cli_value=None):
     """
@@ -237,49 +293,273 @@ def get_or_create_library(conn, root_path: str):
     return cur.lastrowid
 
 
-def link_file_to_library(conn, file_id: int, library_id: int):
+LIBRARY_LINK_SQL = """
+    INSERT INTO file_library_map (file_id, library_id, first_seen, last_update)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(file_id, library_id)
+    DO UPDATE SET last_update=excluded.last_update
+"""
+
+
+def link_files_to_library(conn, file_ids, library_id: int):
     """
-    Upsert mapping between file and library.
+    Upsert mappings between files and a library.
     """
     now = utcnow()
 
-    conn.execute(
-        """
-        INSERT INTO file_library_map (file_id, library_id, first_seen, last_update)
-        VALUES (?, ?, ?, ?)
-        ON CONFLICT(file_id, library_id)
-        DO UPDATE SET last_update=excluded.last_update
-        """,
-        (file_id, library_id, now, now),
+    conn.executemany(
+        LIBRARY_LINK_SQL,
+        [(file_id, library_id, now, now) for file_id in file_ids],
     )
 
 
-def is_audio_file(p: Path):
-    """Return True when `p` points to an audio file we can analyze.
+# Directories listed concurrently while discovering audio files
+WALK_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+
 
-    The function checks both that the path is a file and that the file
-    extension is in the supported list. The extension check is used as
-    a fast filter; Mutagen will do the final parsing during tag
-    extraction.
+def _scan_dir(path: str):
+    """List one directory: ((audio file path, stat) pairs, subdirectory
+    paths).
+
+    DirEntry type checks use the d_type from readdir, so only symlinks
+    cost an extra stat; audio files are stat'ed here, on the walk pool.
+    Unreadable directories and vanished files are skipped.
+    """
+
+    files, dirs = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path)
+                    elif (
+                        os.path.splitext(entry.name)[1].lower() in SUPPORTED_EXTS
+                        and entry.is_file()
+                    ):
+                        files.append((entry.path, entry.stat()))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files, dirs
+
+
+def discover_audio_files(root) -> dict:
+    """Recursively find supported audio files under `root`.
+
+    Returns {path: os.stat_result} with plain str paths spelled as
+    `str(Path(...))` would, ordered for a deterministic ingest order.
+    Same selection as `rglob("*")` filtered to regular files with a
+    SUPPORTED_EXTS suffix (symlinked files count, symlinked directories
+    are not descended), but each directory
+    level is listed and stat'ed in parallel with `os.scandir`.
     """
 
-    return p.is_file() and p.suffix.lower() in SUPPORTED_EXTS
+    top = str(Path(root))
+    found = []
+    frontier = [top]
+
+    with ThreadPoolExecutor(max_workers=WALK_WORKERS) as ex:
+        while frontier:
+            next_frontier = []
+            for files, dirs in ex.map(_scan_dir, frontier):
+                found.extend(files)
+                next_frontier.extend(dirs)
+            frontier = next_frontier
+
+    found.sort()
+    if top == os.curdir:
+        # Path("./x") is "x"; keep stored paths identical
+        cut = len(os.curdir + os.sep)
+        return {p[cut:]: st for p, st in found}
+    return dict(found)
+
 
+HASH_CHUNK_SIZE = 1024 * 1024
 
-def sha256_file(path: Path):
-    """Compute a streaming SHA-256 hex digest for `path`.
+# CPython exposes OpenSSL's implementation (SHA-NI / ARMv8 SHA extensions
+# where the CPU has them) as openssl_sha256; the builtin fallback is
+# several times slower on large FLAC/WAV files.
+if getattr(hashlib.sha256, "__name__", "") != "openssl_sha256":
+    logging.warning("hashlib is not backed by OpenSSL; SHA-256 hashing will be slow")
 
-    Reading in 64KB chunks avoids allocating huge buffers for large
-    files and keeps memory usage predictable.
+
+def _new_sha256():
+    # Content digests are for de-duplication, not security (FIPS builds)
+    return hashlib.sha256(usedforsecurity=False)
+
+
+def _sha256_stream(f):
+    """Hex SHA-256 of unbuffered binary file `f` from its current offset.
+
+    On Python 3.11+ `hashlib.file_digest` runs the read loop in C with a
+    reusable buffer. Older interpreters fall back to 1 MiB chunks read
+    into one preallocated buffer; both keep memory usage predictable.
     """
 
-    h = hashlib.sha256()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(65536), b""):
-            h.update(chunk)
+    if hasattr(hashlib, "file_digest"):
+        return hashlib.file_digest(f, _new_sha256).hexdigest()
+
+    h = _new_sha256()
+    buf = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buf)
+    while n := f.readinto(buf):
+        h.update(view[:n])
     return h.hexdigest()
 
 
+# Files hashed concurrently during a scan
+HASH_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Concurrent readers when the source sits on a spinning disk, where
+# parallel reads turn into seeks; hashing is not the bottleneck there
+ROTATIONAL_READ_WORKERS = 2
+
+
+def is_rotational(path):
+    """True/False when `path`'s block device reports (non-)rotational
+    media (Linux sysfs), None when unknown (other OSes, network or
+    virtual filesystems)."""
+
+    try:
+        dev = os.stat(path).st_dev
+        node = os.path.realpath(
+            f"/sys/dev/block/{os.major(dev)}:{os.minor(dev)}"
+        )
+    except (OSError, AttributeError):
+        return None
+
+    # Partitions keep their queue settings on the parent disk
+    for base in (node, os.path.dirname(node)):
+        try:
+            with open(os.path.join(base, "queue", "rotational")) as f:
+                return f.read().strip() == "1"
+        except OSError:
+            continue
+    return None
+
+
+# How far past the files being read the page cache is warmed
+PREFETCH_AHEAD = HASH_WORKERS
+
+# Reads allowed to complete ahead of the ingest loop; bounds memory
+# while the loop is busy flushing a batch to the DB
+READ_AHEAD = 1024
+
+# Tag parsing is pure Python, so large scans read files on worker
+# processes instead of GIL-bound threads; small ones skip the pool
+# startup cost
+READ_PROCESSES = os.cpu_count() or 1
+READ_PROCESS_THRESHOLD = 500
+
+
+def _fadvise(path, advice_name):
+    """Best-effort posix_fadvise over all of `path`; no-op where the
+    call is unavailable."""
+
+    advice = getattr(os, advice_name, None)
+    if advice is None:
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _willneed(path):
+    """Ask the kernel to start reading `path` into the page cache."""
+    _fadvise(path, "POSIX_FADV_WILLNEED")
+
+
+def _dontneed(path):
+    """Let the kernel drop `path`'s cached pages once it has been read,
+    so a large scan does not push everything else out of the cache."""
+    _fadvise(path, "POSIX_FADV_DONTNEED")
+
+
+def read_audio_file(p, hash_enabled=True):
+    """Per-file reads for ingest: (sha256, tags, detected container).
+
+    When hashing, the container header is taken from the same open
+    file rather than reopening it.
+    """
+
+    if not hash_enabled:
+        return None, extract_tags(p), detect_container_from_header(p)
+
+    with open(p, "rb", buffering=0) as f:
+        header = f.read(HEADER_SIZE)
+        f.seek(0)
+        sha = _sha256_stream(f)
+
+    return sha, extract_tags(p), detect_container(header)
+
+
+def _read_after_prefetch(p, upcoming, hash_enabled, drop_behind):
+    """Pool task: warm the page cache for `upcoming`, then read `p`
+    (and let its pages go afterwards with `drop_behind`)."""
+    if upcoming is not None:
+        _willneed(upcoming)
+    result = read_audio_file(p, hash_enabled)
+    if drop_behind:
+        _dontneed(p)
+    return result
+
+
+def iter_file_reads(
+    paths,
+    hash_enabled=True,
+    workers=HASH_WORKERS,
+    processes=0,
+    drop_behind=False,
+):
+    """Yield `read_audio_file(p)` for each path, in order.
+
+    hashlib releases the GIL while digesting large buffers and tag/header
+    reads are mostly I/O waits, so files are read ahead of the caller on
+    a pool of `workers` threads, or of `processes` worker processes when
+    set (mutagen's parsing then runs outside the GIL), at most
+    READ_AHEAD files ahead. Each task also warms the page cache for the
+    file PREFETCH_AHEAD positions later, so disk reads overlap with
+    hashing; with `drop_behind` a file's pages are released once it has
+    been read. All DB work stays on the caller's thread, which keeps
+    consuming while the pool runs. Pending work is cancelled if the
+    caller stops early.
+    """
+
+    paths = list(paths)
+
+    if processes:
+        ex = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=_pool_mp_context(),
+        )
+    else:
+        ex = ThreadPoolExecutor(max_workers=workers)
+
+    pending = deque()
+    try:
+        for i, p in enumerate(paths):
+            if len(pending) >= READ_AHEAD:
+                yield pending.popleft().result()
+            j = i + PREFETCH_AHEAD
+            upcoming = paths[j] if j < len(paths) else None
+            pending.append(ex.submit(
+                _read_after_prefetch, p, upcoming, hash_enabled, drop_behind,
+            ))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+
+
 def normalize_str(s):
     """Normalize a text value by removing Unicode combining marks.
 
@@ -290,8 +570,7 @@ def normalize_str(s):
 
     if not s:
         return ""
-    s = unicodedata.normalize("NFKD", s)
-    return "".join(c for c in s if not unicodedata.combining(c)).strip()
+    return unicodedata.normalize("NFKD", s).translate(combining_marks_table()).strip()
 
 
 def sanitize_for_fs(s):
@@ -310,7 +589,7 @@ def sanitize_for_fs(s):
     if not s:
         return "Unknown"
     s = normalize_str(s)
-    s = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "_", s)
+    s = s.translate(_FS_BAD)
     return s.strip(" .")[:120]
 
 
@@ -364,33 +643,37 @@ def hash_image_bytes(data: bytes) -> str:
 
 # ================= DATABASE HELPERS =================
 
-def ensure_column(c, table, column, ddl):
+def ensure_column(c, table, column, ddl, cols_cache=None):
     """Add a column to `table` when it does not exist.
 
     This performs a safe, minimal schema migration by checking the
     existing columns via `PRAGMA table_info`. It is intentionally
     permissive: if the column exists nothing happens, which means this
     function is idempotent and safe to call on every startup.
+
+    Pass the same `cols_cache` dict to a series of calls to read each
+    table's columns only once.
     """
 
-    cols = [r["name"] for r in c.execute(f"PRAGMA table_info({table})")]
+    cols = table_columns(c, table, cols_cache)
     if column not in cols:
         log({
             "key": MSG_SCHEMA_UPGRADE_ADD_COLUMN,
             "params": {"table": table, "column": column}
         })
         c.execute(f"ALTER TABLE {table} ADD COLUMN {ddl}")
+        cols.add(column)
 
-def ensure_export_columns(c):
-    ensure_column(c, "files", "export_name_cache", "export_name_cache TEXT")
+def ensure_export_columns(c, cols_cache=None):
+    ensure_column(c, "files", "export_name_cache", "export_name_cache TEXT", cols_cache)
 
-def ensure_normalized_columns(c):
-    ensure_column(c, "files", "artist_norm", "artist_norm TEXT")
-    ensure_column(c, "files", "album_artist_norm", "album_artist_norm TEXT")
-    ensure_column(c, "files", "album_norm", "album_norm TEXT")
-    ensure_column(c, "files", "title_norm", "title_norm TEXT")
+def ensure_normalized_columns(c, cols_cache=None):
+    ensure_column(c, "files", "artist_norm", "artist_norm TEXT", cols_cache)
+    ensure_column(c, "files", "album_artist_norm", "album_artist_norm TEXT", cols_cache)
+    ensure_column(c, "files", "album_norm", "album_norm TEXT", cols_cache)
+    ensure_column(c, "files", "title_norm", "title_norm TEXT", cols_cache)
 
-def ensure_metadata_columns(c):
+def ensure_metadata_columns(c, cols_cache=None):
     """
     Ensure all optional metadata columns exist.
 
@@ -399,18 +682,18 @@ def ensure_metadata_columns(c):
     users to rebuild their database.
     """
 
-    ensure_column(c, "files", "composer", "composer TEXT")
-    ensure_column(c, "files", "year", "year TEXT")
-    ensure_column(c, "files", "bpm", "bpm INTEGER")
-    ensure_column(c, "files", "disc", "disc TEXT")
-    ensure_column(c, "files", "track_total", "track_total TEXT")
-    ensure_column(c, "files", "disc_total", "disc_total TEXT")
-    ensure_column(c, "files", "comment", "comment TEXT")
-    ensure_column(c, "files", "lyrics", "lyrics TEXT")
-    ensure_column(c, "files", "publisher", "publisher TEXT")
-    ensure_column(c, "files", "quarantined_path","quarantined_path TEXT")
-    ensure_column(c, "files", "quarantined_at","quarantined_at TEXT")
-    ensure_column(c, "files", "delete_mode","delete_mode TEXT DEFAULT 'quarantine'")
+    ensure_column(c, "files", "composer", "composer TEXT", cols_cache)
+    ensure_column(c, "files", "year", "year TEXT", cols_cache)
+    ensure_column(c, "files", "bpm", "bpm INTEGER", cols_cache)
+    ensure_column(c, "files", "disc", "disc TEXT", cols_cache)
+    ensure_column(c, "files", "track_total", "track_total TEXT", cols_cache)
+    ensure_column(c, "files", "disc_total", "disc_total TEXT", cols_cache)
+    ensure_column(c, "files", "comment", "comment TEXT", cols_cache)
+    ensure_column(c, "files", "lyrics", "lyrics TEXT", cols_cache)
+    ensure_column(c, "files", "publisher", "publisher TEXT", cols_cache)
+    ensure_column(c, "files", "quarantined_path","quarantined_path TEXT", cols_cache)
+    ensure_column(c, "files", "quarantined_at","quarantined_at TEXT", cols_cache)
+    ensure_column(c, "files", "delete_mode","delete_mode TEXT DEFAULT 'quarantine'", cols_cache)
 
 
 def ensure_alias_views(c):
@@ -478,16 +761,13 @@ def ensure_alias_views(c):
           AND f1.title_norm != ''
     """)
 
-    # --- Union of all signals ---
+    # --- Union of all signals (materialized by refresh_alias_pairs) ---
+    ensure_alias_pairs_table(c)
+
     c.execute("""
         CREATE VIEW IF NOT EXISTS alias_pairs_all AS
-        SELECT * FROM alias_pairs_sha256
-        UNION ALL
-        SELECT * FROM alias_pairs_fingerprint
-        UNION ALL
-        SELECT * FROM alias_pairs_artist_title
-        UNION ALL
-        SELECT * FROM alias_pairs_album_title
+        SELECT file_id, other_file_id, signal_type, strength
+        FROM alias_pairs
     """)
 
     # --- Converged confidence ---
@@ -531,16 +811,17 @@ def ensure_alias_views(c):
           );
     """)
 
-def ensure_mark_delete_column(c):
-    cols = [r[1] for r in c.execute("PRAGMA table_info(files)").fetchall()]
+def ensure_mark_delete_column(c, cols_cache=None):
+    cols = table_columns(c, "files", cols_cache)
     if "mark_delete" not in cols:
         log("Adding mark_delete column to files table")
         c.execute("""
             ALTER TABLE files
             ADD COLUMN mark_delete INTEGER DEFAULT 0
         """)
+        cols.add("mark_delete")
 
-def ensure_genres_columns(c):
+def ensure_genres_columns(c, cols_cache=None):
     """
     Ensure optional / forward-compatible columns on `genres`.
     """
@@ -548,7 +829,8 @@ def ensure_genres_columns(c):
         c,
         "genres",
         "active",
-        "active INTEGER DEFAULT 1"
+        "active INTEGER DEFAULT 1",
+        cols_cache,
     )
 
 def ensure_export_tables(c):
@@ -581,46 +863,40 @@ def ensure_export_tables(c):
         )
     """)
 
-def normalize_file_row(c, file_id):
-    """Compute and persist normalized textual fields for a file.
+# Rewrites only rows whose stored norms no longer match their tags;
+# normalize_text is registered on the connection as an SQL function
+RENORMALIZE_SQL = """
+    UPDATE files
+    SET
+        artist_norm = normalize_text(artist),
+        album_artist_norm = normalize_text(album_artist),
+        album_norm = normalize_text(album),
+        title_norm = normalize_text(title)
+    WHERE artist_norm IS NOT normalize_text(artist)
+       OR album_artist_norm IS NOT normalize_text(album_artist)
+       OR album_norm IS NOT normalize_text(album)
+       OR title_norm IS NOT normalize_text(title)
+"""
 
-    The `normalize_text` function (imported from `normalization`) is
-    the project's canonical normalizer for comparing artists,
-    albums and titles. Normalized fields are used by the database
-    views in `ensure_alias_views` to detect likely duplicates where
-    tags differ by punctuation, case or similar noise.
-    """
 
-    row = c.execute(
-        """
-        SELECT artist, album_artist, album, title
-        FROM files
-        WHERE id = ?
-        """,
-        (file_id,),
-    ).fetchone()
+def renormalize_files(conn):
+    """Recompute normalized fields from stored tags (normalize-only mode).
 
-    if not row:
-        return
+    The `normalize_text` function (imported from `normalization`) is
+    the project's canonical normalizer for comparing artists, albums
+    and titles; the alias views read these fields. Ingest writes them
+    in the files upsert, so here a single UPDATE touches only rows that
+    are stale (e.g. after a normalizer change), then alias pairs are
+    re-materialized since their tag signals read those fields.
+    """
 
-    c.execute(
-        """
-        UPDATE files
-        SET
-            artist_norm = ?,
-            album_artist_norm = ?,
-            album_norm = ?,
-            title_norm = ?
-        WHERE id = ?
-        """,
-        (
-            normalize_text(row["artist"]),
-            normalize_text(row["album_artist"]),
-            normalize_text(row["album"]),
-            normalize_text(row["title"]),
-            file_id,
-        ),
-    )
+    c = conn.cursor()
+    with conn:
+        conn.create_function(
+            "normalize_text", 1, normalize_text, deterministic=True
+        )
+        c.execute(RENORMALIZE_SQL)
+        refresh_alias_pairs(c)
 
 
 # ================= DATABASE =================
@@ -628,7 +904,7 @@ def normalize_file_row(c, file_id):
 def create_db(db_path):
     """Create the SQLite schema used by the consolidation pipeline."""
 
-    conn = sqlite3.connect(db_path)
+    conn = open_ingest_db(db_path)
     conn.row_factory = sqlite3.Row
     c = conn.cursor()
 
@@ -789,12 +1065,14 @@ def create_db(db_path):
     """)
 
     # Existing additive migrations (your helpers)
-    ensure_metadata_columns(c)
-    ensure_export_columns(c)
-    ensure_normalized_columns(c)
-    ensure_genres_columns(c)
+    cols = {}
+    ensure_metadata_columns(c, cols)
+    ensure_export_columns(c, cols)
+    ensure_normalized_columns(c, cols)
+    ensure_genres_columns(c, cols)
     ensure_alias_views(c)
-    ensure_mark_delete_column(c)
+    ensure_mark_delete_column(c, cols)
+    ensure_files_lookup_indexes(c, cols)
     ensure_export_tables(c)
 
     # --- Ensure pedro_environment row exists ---
@@ -824,8 +1102,8 @@ def compute_fingerprint(path: Path):
     Steps:
     1. Use `ffmpeg` to render the first `FP_SECONDS` seconds of audio to
        a raw PCM stream (`s16le`, mono, 44.1kHz).
-    2. Feed the raw PCM to Chromaprint's fingerprinter and obtain a
-       fingerprint string.
+    2. Feed the raw PCM to Chromaprint's fingerprinter chunk by chunk
+       as ffmpeg produces it, then obtain a fingerprint string.
     3. Hash the fingerprint with SHA-1 to keep stored values concise
        and consistent.
 
@@ -849,48 +1127,159 @@ def compute_fingerprint(path: Path):
             "-"
         ]
 
-        proc = subprocess.run(
+        fp = chromaprint.Fingerprinter(44100, 1)
+        fed = False
+
+        with subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.DEVNULL,
-            check=True
-        )
-
-        if not proc.stdout:
+        ) as proc:
+            try:
+                for chunk in iter(functools.partial(proc.stdout.read, FP_CHUNK_SIZE), b""):
+                    fp.feed(chunk)
+                    fed = True
+            except BaseException:
+                # Don't leave ffmpeg blocked on a full pipe
+                proc.kill()
+                raise
+
+        if proc.returncode != 0 or not fed:
             return None
 
-        fp = chromaprint.Fingerprinter(44100, 1)
-        fp.feed(proc.stdout)
         fingerprint, _ = fp.finish()
 
         # Store a short, stable representation by hashing the
         # fingerprint payload. SHA-1 is used here because we don't need
-        # cryptographic strength — only a compact, stable id.
-        return hashlib.sha1(fingerprint.encode()).hexdigest()
+        # cryptographic strength — only a compact, stable id. It stays
+        # SHA-1 so ids match those already stored; usedforsecurity=False
+        # keeps it available on FIPS-mode OpenSSL builds.
+        return hashlib.sha1(fingerprint.encode(), usedforsecurity=False).hexdigest()
 
     except Exception:
         # Fingerprint computation is best-effort; failures shouldn't
         # abort the entire analysis pipeline.
         return None
-    
+
+
+# Files fingerprinted concurrently (ffmpeg decode + Chromaprint are CPU-bound)
+FP_WORKERS = os.cpu_count() or 1
+
+
+def _pool_mp_context():
+    # forkserver workers start from a clean, small server process rather
+    # than forking a parent that may hold threads and open connections
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return None
+
+
+def iter_fingerprints(paths, enabled=True):
+    """Yield `compute_fingerprint(p)` for each path, in order.
+
+    Work is spread over a process pool of FP_WORKERS. Yields None per
+    path when disabled or when Chromaprint is unavailable. Pending work
+    is cancelled if the caller stops early.
+    """
+
+    if not enabled or not ENABLE_CHROMAPRINT or chromaprint is None or not paths:
+        for _ in paths:
+            yield None
+        return
+
+    ex = ProcessPoolExecutor(
+        max_workers=FP_WORKERS,
+        mp_context=_pool_mp_context(),
+    )
+    try:
+        yield from ex.map(compute_fingerprint, paths, chunksize=4)
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+
 # ================= METADATA =================
 
+# Tag keys flagging a compilation: ID3 TCMP, MP4 cpil, Vorbis/APE
+# COMPILATION (those two look keys up case-insensitively). Easy ID3 tags
+# expose TCMP as "compilation"; MP4 is read raw (see below).
+COMPILATION_TAG_KEYS = ("TCMP", "cpil", "compilation")
+
+# MP4 is parsed without the easy wrapper, whose tags hide cpil; fields
+# are read straight from the atoms EasyMP4Tags maps them to
+MP4_EXTS = {".m4a"}
+MP4_TEXT_ATOMS = {
+    "artist": "\xa9ART",
+    "albumartist": "aART",
+    "album": "\xa9alb",
+    "title": "\xa9nam",
+    "date": "\xa9day",
+    "comment": "\xa9cmt",
+    "genre": "\xa9gen",
+}
+MP4_PAIR_ATOMS = {"tracknumber": "trkn", "discnumber": "disk"}
+
+
+def _mp4_easy_tags(raw):
+    """First value per easy key, spelled the way EasyMP4Tags reports it."""
+
+    tags = {}
+    if raw is None:
+        return tags
+
+    for key, atom in MP4_TEXT_ATOMS.items():
+        values = raw.get(atom)
+        if values:
+            tags[key] = str(values[0])
+
+    for key, atom in MP4_PAIR_ATOMS.items():
+        values = raw.get(atom)
+        if values:
+            number, total = values[0]
+            tags[key] = f"{number}/{total}" if total else str(number)
+
+    tempo = raw.get("tmpo")
+    if tempo:
+        tags["bpm"] = str(tempo[0])
+
+    return tags
+
+
+def _read_tags(path):
+    """Parse `path` once; return (audio, {easy key: first value}, raw tags)."""
+
+    if os.path.splitext(path)[1].lower() in MP4_EXTS:
+        try:
+            audio = MP4(path)
+        except MutagenError:
+            # Not an MP4 container after all; let Mutagen sniff it
+            pass
+        else:
+            return audio, _mp4_easy_tags(audio.tags), audio.tags
+
+    audio = MutagenFile(path, easy=True)
+    if not audio:
+        return audio, {}, None
+
+    tags = {
+        str(k).lower(): (v[0] if v else None)
+        for k, v in audio.items()
+    }
+    return audio, tags, audio.tags
+
+
 def extract_tags(path: Path):
     """Extract tags and technical info from an audio file using Mutagen."""
     try:
-        audio = MutagenFile(path, easy=True)
-        raw = MutagenFile(path, easy=False)
+        # One parse: every field below reads the plain `tags` snapshot,
+        # the compilation flag reads the same parse's tag object
+        audio, tags, raw_tags = _read_tags(path)
 
-        album_artist = audio.get("albumartist", [None])[0] if audio else None
+        album_artist = tags.get("albumartist")
         is_comp = 0
 
-        if raw and hasattr(raw, "tags"):
-            for k in raw.tags.keys():
-                if str(k).lower() in ("tcmp", "compilation", "cpil"):
-                    is_comp = 1
-                    break
+        if raw_tags is not None:
+            is_comp = int(any(k in raw_tags for k in COMPILATION_TAG_KEYS))
 
-        track_raw = audio.get("tracknumber", [None])[0] if audio else None
+        track_raw = tags.get("tracknumber")
         track = normalize_track(track_raw)
         track_total = None
         if track_raw and "/" in str(track_raw):
@@ -898,7 +1287,7 @@ def extract_tags(path: Path):
             if len(parts) == 2:
                 track_total = parts[1]
 
-        disc_raw = audio.get("discnumber", [None])[0] if audio else None
+        disc_raw = tags.get("discnumber")
         disc = disc_raw.split("/")[0] if disc_raw and "/" in str(disc_raw) else disc_raw
         disc_total = None
         if disc_raw and "/" in str(disc_raw):
@@ -906,11 +1295,13 @@ def extract_tags(path: Path):
             if len(parts) == 2:
                 disc_total = parts[1]
 
+        bpm_raw = tags.get("bpm")
+
         return {
-            "artist": audio.get("artist", [None])[0] if audio else None,
+            "artist": tags.get("artist"),
             "album_artist": album_artist,
-            "album": audio.get("album", [None])[0] if audio else None,
-            "title": audio.get("title", [None])[0] if audio else None,
+            "album": tags.get("album"),
+            "title": tags.get("title"),
 
             "track": track,
             "track_total": track_total,
@@ -918,24 +1309,19 @@ def extract_tags(path: Path):
             "disc_total": disc_total,
 
             # ---------- NEW METADATA ----------
-            "composer": audio.get("composer", [None])[0] if audio else None,
-            "year": audio.get("date", [None])[0] if audio else None,
-            "bpm": (
-                int(audio.get("bpm", [None])[0])
-                if audio and audio.get("bpm", [None])[0]
-                and str(audio.get("bpm", [None])[0]).isdigit()
-                else None
-            ),
-            "comment": audio.get("comment", [None])[0] if audio else None,
+            "composer": tags.get("composer"),
+            "year": tags.get("date"),
+            "bpm": int(bpm_raw) if bpm_raw and str(bpm_raw).isdigit() else None,
+            "comment": tags.get("comment"),
             "lyrics": None,
-            "publisher": audio.get("publisher", [None])[0] if audio else None,
+            "publisher": tags.get("publisher"),
             # ----------------------------------
 
-            "genre": audio.get("genre", [None])[0] if audio else None,
+            "genre": tags.get("genre"),
             "duration": getattr(audio.info, "length", None) if audio else None,
             "bitrate": getattr(audio.info, "bitrate", None) if audio else None,
             "is_compilation": is_comp,
-            "orig_name": path.stem,
+            "orig_name": os.path.splitext(os.path.basename(path))[0],
         }
 
     except Exception:
@@ -961,11 +1347,299 @@ def extract_tags(path: Path):
             "duration": None,
             "bitrate": None,
             "is_compilation": 0,
-            "orig_name": path.stem,
+            "orig_name": os.path.splitext(os.path.basename(path))[0],
         }
 
 # ================= INGEST =================
 
+# Files written (and committed) per ingest transaction
+INGEST_BATCH_SIZE = 5000
+
+# INSERT ... RETURNING needs SQLite 3.35; older libraries re-select ids
+UPSERT_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+FILES_UPSERT_COLUMNS = (
+    "original_path", "sha256", "size_bytes", "mtime_ns",
+    "artist", "album_artist", "album", "title",
+    "track", "track_total",
+    "disc", "disc_total",
+    "genre", "composer", "year", "bpm", "comment", "lyrics", "publisher",
+    "duration", "bitrate", "fingerprint",
+    "is_compilation", "recommended_path",
+    "lifecycle_state",
+    "first_seen", "last_update",
+    "notes",
+    "artist_norm", "album_artist_norm", "album_norm", "title_norm",
+)
+
+# Tag-derived columns a rescan may refresh on an existing row; identity,
+# lifecycle and planning columns are never touched by the upsert
+FILES_UPSERT_TAG_COLUMNS = FILES_UPSERT_COLUMNS[
+    FILES_UPSERT_COLUMNS.index("artist"):FILES_UPSERT_COLUMNS.index("recommended_path")
+]
+
+# Tags with a normalized *_norm twin, written by the same upsert
+FILES_UPSERT_NORM_SOURCES = ("artist", "album_artist", "album", "title")
+FILES_UPSERT_NORM_META = itemgetter(*FILES_UPSERT_NORM_SOURCES)
+
+# extract_tags keys named like their columns (artist .. bitrate), read
+# in column order with one C-level call per file
+FILES_UPSERT_META = itemgetter(*FILES_UPSERT_COLUMNS[
+    FILES_UPSERT_COLUMNS.index("artist"):FILES_UPSERT_COLUMNS.index("fingerprint")
+])
+
+# Rows packed into one INSERT, keeping bound parameters under SQLite's
+# conservative default SQLITE_MAX_VARIABLE_NUMBER (999)
+FILES_UPSERT_ROWS = 999 // len(FILES_UPSERT_COLUMNS)
+
+
+INGEST_EXISTING_PATHS_SQL = """
+    SELECT original_path FROM files
+    WHERE original_path IN (SELECT value FROM json_each(?))
+"""
+
+INGEST_FILE_IDS_SQL = """
+    SELECT original_path, id FROM files
+    WHERE original_path IN (SELECT value FROM json_each(?))
+"""
+
+DETECTED_CONTAINER_SQL = """
+    UPDATE files
+    SET detected_container = COALESCE(detected_container, ?)
+    WHERE id = ?
+"""
+
+# Rows under one source root: a range scan of the original_path unique
+# index, bounded by the root prefix and the next possible prefix
+KNOWN_FILES_SQL = """
+    SELECT original_path, size_bytes, mtime_ns, sha256 FROM files
+    WHERE original_path >= ? AND original_path < ?
+    AND mtime_ns IS NOT NULL
+"""
+
+ACTIONS_INSERT_SQL = """
+    INSERT INTO actions (
+        file_id, action, src_path, dst_path, created_at
+    )
+    VALUES (?, 'move', ?, ?, ?)
+"""
+
+
+# Secondary files indexes that every upsert/normalize write maintains.
+# Large ingests drop them up front and rebuild each once at the end.
+BULK_DEFERRED_INDEXES = (
+    "idx_files_lifecycle",
+    "idx_files_size",
+    "idx_files_sha256",
+    "idx_files_fingerprint",
+    "idx_files_artist_title_norm",
+    "idx_files_album_title_norm",
+)
+
+# Discovered files above which index maintenance is deferred
+BULK_INDEX_THRESHOLD = 5000
+
+
+@contextmanager
+def deferred_indexes(conn, enabled=True, names=BULK_DEFERRED_INDEXES):
+    """Drop the named indexes for the duration of the block, then
+    recreate them from their stored DDL.
+
+    Indexes that do not exist are left alone. They are rebuilt and
+    committed even when the block fails; if the process dies instead,
+    the next create_db / analyze_files run recreates them through
+    ensure_files_lookup_indexes.
+    """
+
+    if not enabled:
+        yield
+        return
+
+    ddl = conn.execute(
+        f"""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND name IN ({",".join("?" * len(names))})
+        """,
+        names,
+    ).fetchall()
+
+    for name, _ in ddl:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    conn.commit()
+
+    try:
+        yield
+    finally:
+        # sqlite_master keeps the plain CREATE INDEX text
+        for _, sql in ddl:
+            conn.execute(sql)
+        conn.commit()
+
+
+def load_unchanged_files(conn, root, stats, need_sha256=True):
+    """Return {path: stored sha256} for files whose (size, mtime_ns) match
+    the row recorded by a previous scan.
+
+    `stats` maps each path discovered under `root` to its
+    os.stat_result. Such files need neither a new digest nor a tag
+    parse. When `need_sha256` is set a row without a stored digest never
+    counts as unchanged.
+
+    Known rows are streamed once by path prefix and matched in memory,
+    so there is no per-file query and no need to ship the discovered
+    path list to SQLite.
+    """
+
+    unchanged = {}
+
+    # Discovery spells paths like str(Path(...)), so "." has no prefix
+    top = str(Path(root))
+    if top == os.curdir:
+        prefix, upper = "", chr(0x10FFFF)
+    else:
+        prefix = os.path.join(top, "")
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+    for path, size, mtime_ns, sha in conn.execute(KNOWN_FILES_SQL, (prefix, upper)):
+        st = stats.get(path)
+        if st is None:
+            continue
+        if size != st.st_size or mtime_ns != st.st_mtime_ns:
+            continue
+        if need_sha256 and sha is None:
+            continue
+        unchanged[path] = sha
+
+    return unchanged
+
+
+@functools.lru_cache(maxsize=None)
+def files_upsert_sql(rows: int, overwrite: bool = False) -> str:
+    """Multi-row files upsert for `rows` VALUES tuples (cached per size
+    and mode).
+
+    On conflict each tag column is one COALESCE: with `overwrite` a new
+    non-NULL value replaces the stored one, otherwise it only fills a
+    NULL. Rows carried over unchanged hold NULL tags and keep theirs.
+    The *_norm columns are recomputed from that same resulting value
+    (SET expressions see the old row), so the SQL function
+    `normalize_text` must be registered on the connection.
+    """
+    row = "(" + ", ".join("?" * len(FILES_UPSERT_COLUMNS)) + ")"
+    if overwrite:
+        kept = "COALESCE(excluded.{0}, {0})"
+    else:
+        kept = "COALESCE({0}, excluded.{0})"
+    tags = [f"{col} = {kept.format(col)}" for col in FILES_UPSERT_TAG_COLUMNS]
+    tags += [
+        f"{col}_norm = normalize_text({kept.format(col)})"
+        for col in FILES_UPSERT_NORM_SOURCES
+    ]
+    return f"""
+        INSERT INTO files ({", ".join(FILES_UPSERT_COLUMNS)})
+        VALUES {", ".join([row] * rows)}
+        ON CONFLICT(original_path) DO UPDATE SET
+        sha256 = COALESCE(excluded.sha256, sha256),
+        size_bytes = COALESCE(excluded.size_bytes, size_bytes),
+        mtime_ns = COALESCE(excluded.mtime_ns, mtime_ns),
+        {", ".join(tags)},
+        last_update = excluded.last_update
+        {"RETURNING original_path, id" if UPSERT_RETURNING else ""}
+    """
+
+
+def flush_ingest_batch(conn, batch, *, library_id=None, create_actions=False, overwrite=False):
+    """Write one batch of analyzed files in a single transaction.
+
+    `batch` holds (insert_values, recommended_path, detected_container,
+    seen_at) per file, insert_values matching FILES_UPSERT_COLUMNS. Every
+    per-file statement of the old loop becomes one executemany here.
+
+    The transaction takes the write lock up front (BEGIN IMMEDIATE) and
+    file ids come back from the upsert itself (RETURNING). Normalized
+    fields are written by the upsert too.
+    """
+
+    paths_json = json.dumps([values[0] for values, _, _, _ in batch])
+
+    with conn:
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+
+        conn.create_function(
+            "normalize_text", 1, normalize_text, deterministic=True
+        )
+        c = conn.cursor()
+
+        # Only move actions need to know which paths are new
+        existing = set()
+        if create_actions:
+            existing = {
+                r[0] for r in c.execute(INGEST_EXISTING_PATHS_SQL, (paths_json,))
+            }
+
+        # Full FILES_UPSERT_ROWS statements, then one shorter tail statement
+        ids = {}
+        for i in range(0, len(batch), FILES_UPSERT_ROWS):
+            chunk = batch[i:i + FILES_UPSERT_ROWS]
+            c.execute(
+                files_upsert_sql(len(chunk), overwrite),
+                [v for values, _, _, _ in chunk for v in values],
+            )
+            if UPSERT_RETURNING:
+                ids.update(c.fetchall())
+
+        if not UPSERT_RETURNING:
+            ids = dict(c.execute(INGEST_FILE_IDS_SQL, (paths_json,)).fetchall())
+
+        # ---------------- STORE DETECTED CONTAINER ----------------
+        c.executemany(
+            DETECTED_CONTAINER_SQL,
+            [
+                (detected_container, ids[values[0]])
+                for values, _, detected_container, _ in batch
+                if detected_container
+            ],
+        )
+
+        # ---------------- MULTI-LIBRARY LINK ----------------
+        if library_id:
+            link_files_to_library(conn, ids.values(), library_id)
+
+        # Create move actions for newly seen files
+        if create_actions:
+            c.executemany(
+                ACTIONS_INSERT_SQL,
+                [
+                    (ids[values[0]], values[0], rec, seen_at)
+                    for values, rec, _, seen_at in batch
+                    if values[0] not in existing
+                ],
+            )
+
+
+def analyze_one_file(p, st, read, fp, rec_root, now, *, lifecycle_state):
+    """Build the ingest batch entry for a new or modified file. `read`
+    comes from iter_file_reads and `fp` from the fingerprint pool; a
+    recommended path is only planned when `rec_root` is set."""
+
+    sha, meta, detected_container = read
+
+    rec = (
+        recommended_path_for(rec_root, meta, os.path.splitext(p)[1])
+        if rec_root else None
+    )
+
+    insert_values = (
+        (p, sha, st.st_size, st.st_mtime_ns)
+        + FILES_UPSERT_META(meta)
+        + (fp, meta["is_compilation"], rec, lifecycle_state, now, now, None)
+        + tuple(map(normalize_text, FILES_UPSERT_NORM_META(meta)))
+    )
+
+    return insert_values, rec, detected_container, now
+
+
 def analyze_files(
     src,
     lib,
@@ -976,7 +1650,7 @@ def analyze_files(
     only_states=None,
     exclude_states=None,
     db_mode="full",
-    no_overwrite=False,
+    no_overwrite=True,
     lifecycle_state="ANALYZED",
     create_actions=True,
 ):
@@ -985,7 +1659,7 @@ def analyze_files(
     if db_mode not in ALLOWED_DB_MODES:
         raise RuntimeError(f"Invalid db_mode: {db_mode}")
 
-    conn = sqlite3.connect(db_path)
+    conn = open_ingest_db(db_path)
     conn.row_factory = sqlite3.Row
     c = conn.cursor()
 
@@ -996,7 +1670,19 @@ def analyze_files(
         "SELECT name FROM sqlite_master WHERE type='table'"
     )}
     if "files" in tables:
-        ensure_column(c, "files", "detected_container", "detected_container TEXT")
+        cols = {}
+        ensure_column(c, "files", "detected_container", "detected_container TEXT", cols)
+        ensure_column(c, "files", "mtime_ns", "mtime_ns INTEGER", cols)
+        # Restores indexes a killed bulk scan left dropped
+        ensure_files_lookup_indexes(c, cols)
+        conn.commit()
+
+    # Normalize-only mode: no file access
+    if db_mode == "normalize-only":
+        renormalize_files(conn)
+        conn.close()
+        log(MSG_ANALYSIS_COMPLETE)
+        return
 
     # ---------------- MULTI-LIBRARY ----------------
     library_id = None
@@ -1034,115 +1720,101 @@ def analyze_files(
     if not src:
         raise RuntimeError("src must be provided for db_mode = " + db_mode)
 
-    audio_list = [p for p in Path(src).rglob("*") if is_audio_file(p)]
+    stats = discover_audio_files(src)
+    audio_list = list(stats)
     log({"key": MSG_FOUND_AUDIO_FILES, "params": {"count": len(audio_list)}})
 
-    for p in maybe_progress(audio_list, "Analyzing", progress):
-        meta = extract_tags(p)
-
-        sha = sha256_file(p) if db_mode != "db-update-only" else None
-        fp = compute_fingerprint(p) if (with_fingerprint and db_mode == "full") else None
-        rec = recommended_path_for(lib, meta, p.suffix) if db_mode == "full" else None
-        now = utcnow()
-        detected_container = detect_container_from_header(str(p))
-
-        row = c.execute(
-            "SELECT id, lifecycle_state FROM files WHERE original_path=?",
-            (str(p),)
-        ).fetchone()
-
-        if row:
-            is_new = False
-        else:
-            is_new = True
-
-        sql = """ INSERT INTO files (
-            original_path, sha256, size_bytes,
-            artist, album_artist, album, title,
-            track, track_total,
-            disc, disc_total,
-            genre, composer, year, bpm, comment, lyrics, publisher,
-            duration, bitrate, fingerprint,
-            is_compilation, recommended_path,
-            lifecycle_state,
-            first_seen, last_update,
-            notes
-        )
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(original_path) DO UPDATE SET
-        sha256 = COALESCE(excluded.sha256, sha256),
-        size_bytes = COALESCE(excluded.size_bytes, size_bytes),
-        last_update = excluded.last_update
-        """
-
-        insert_values = (
-            str(p),
-            sha,
-            p.stat().st_size,
-            meta["artist"],
-            meta["album_artist"],
-            meta["album"],
-            meta["title"],
-            meta["track"],
-            meta["track_total"],
-            meta["disc"],
-            meta["disc_total"],
-            meta.get("genre"),
-            meta.get("composer"),
-            meta.get("year"),
-            meta.get("bpm"),
-            meta.get("comment"),
-            meta.get("lyrics"),
-            meta.get("publisher"),
-            meta["duration"],
-            meta["bitrate"],
-            fp,
-            meta["is_compilation"],
-            rec,
-            lifecycle_state,
-            now,
-            now,
-            None,
-        )
-
-        c.execute(sql, insert_values)
+    batch = []
+
+    # Incremental rescan: files whose (size, mtime_ns) match the stored row
+    # keep their digest and tags; only new or modified files are read.
+    hash_enabled = db_mode != "db-update-only"
+    unchanged = load_unchanged_files(conn, src, stats, need_sha256=hash_enabled)
+
+    to_analyze = [p for p in audio_list if p not in unchanged]
+    # Storage class decides the read strategy: a spinning disk gets a
+    # couple of sequential readers (plus page-cache prefetch), anything
+    # else a full pool since hashing and tag parsing are then the
+    # bottleneck (worker processes once the scan is large enough)
+    rotational = is_rotational(src)
+    read_workers = ROTATIONAL_READ_WORKERS if rotational else HASH_WORKERS
+    read_processes = (
+        READ_PROCESSES
+        if not rotational
+        and READ_PROCESSES > 1
+        and len(to_analyze) >= READ_PROCESS_THRESHOLD
+        else 0
+    )
+    fingerprinting = with_fingerprint and db_mode == "full"
+    reads = iter_file_reads(
+        to_analyze,
+        hash_enabled=hash_enabled,
+        workers=read_workers,
+        processes=read_processes,
+        # The fingerprint pool decodes the same files, so keep their
+        # pages cached for it
+        drop_behind=not fingerprinting,
+    )
+    fingerprints = iter_fingerprints(to_analyze, enabled=fingerprinting)
 
-        file_id = c.execute(
-            "SELECT id FROM files WHERE original_path=?",
-            (str(p),)
-        ).fetchone()[0]
+    bulk = (
+        db_mode in ("full", "db-update-only")
+        and len(audio_list) > BULK_INDEX_THRESHOLD
+    )
 
-        # ---------------- STORE DETECTED CONTAINER ----------------
-        if detected_container and detected_container != "":
-            c.execute("""
-                UPDATE files
-                SET detected_container = COALESCE(detected_container, ?)
-                WHERE id = ?
-            """, (detected_container, file_id))
+    ingest_actions = create_actions and db_mode == "full"
+    overwrite = not no_overwrite
+    rec_root = lib if db_mode == "full" else None
+
+    with deferred_indexes(conn, enabled=bulk):
+        for p in maybe_progress(audio_list, "Analyzing", progress):
+            st = stats[p]
+
+            # One timestamp per ingest batch: its rows are written together
+            if not batch:
+                now = utcnow()
+
+            if p in unchanged:
+                # Existing row: NULL tags make the upsert keep the stored
+                # ones (and re-derive their norms), so no tags are needed
+                insert_values = (
+                    (p, unchanged[p], st.st_size, st.st_mtime_ns)
+                    + (None,) * (
+                        len(FILES_UPSERT_COLUMNS) - 8 - len(FILES_UPSERT_NORM_SOURCES)
+                    )
+                    + (lifecycle_state, now, now, None)
+                    + (None,) * len(FILES_UPSERT_NORM_SOURCES)
+                )
+                batch.append((insert_values, None, None, now))
+            else:
+                batch.append(analyze_one_file(
+                    p, st, next(reads), next(fingerprints), rec_root, now,
+                    lifecycle_state=lifecycle_state,
+                ))
+
+            # Album art placeholder (search_covers):
+            # ingest_album_art_for_file(...)
 
-        # ---------------- MULTI-LIBRARY LINK ----------------
-        if library_id:
-            link_file_to_library(conn, file_id, library_id)
+            if len(batch) >= INGEST_BATCH_SIZE:
+                flush_ingest_batch(
+                    conn, batch,
+                    library_id=library_id,
+                    create_actions=ingest_actions,
+                    overwrite=overwrite,
+                )
+                batch = []
 
-        # Normalize
-        normalize_file_row(c, file_id)
+        if batch:
+            flush_ingest_batch(
+                conn, batch,
+                library_id=library_id,
+                create_actions=ingest_actions,
+                overwrite=overwrite,
+            )
 
-        # Create move actions
-        if is_new and db_mode == "full" and create_actions:
-            c.execute("""
-                INSERT INTO actions (
-                    file_id, action, src_path, dst_path, created_at
-                )
-                VALUES (?, 'move', ?, ?, ?)
-            """, (file_id, str(p), rec, now))
-
-        # Album art placeholder
-        if search_covers and db_mode == "full":
-            file_row = c.execute("""
-                SELECT album_artist, album, is_compilation
-                FROM files WHERE id=?
-            """, (file_id,)).fetchone()
-            # ingest_album_art_for_file(...)
+    # Re-materialize alias pairs against the new file set (indexes are
+    # back in place by now, so the signal self-joins can use them)
+    refresh_alias_pairs(c)
 
     # ---------------- FINALIZE SCAN ----------------
     try:
@@ -1176,7 +1848,9 @@ def main():
         default="full",
         help="Control how Pedro updates the database"
     )
+    # Rescans never replace stored tags unless asked to
     parser.add_argument("--no-overwrite", action="store_true")
+    parser.add_argument("--overwrite", action="store_true")
 
     args = parser.parse_args()
 
@@ -1192,7 +1866,7 @@ def main():
         with_fingerprint=args.with_fingerprint,
         search_covers=args.search_covers,
         db_mode=args.db_mode,
-        no_overwrite=args.no_overwrite,
+        no_overwrite=not args.overwrite,
     )
 
 if __name__ == "__main__":
@@ -1,12 +1,20 @@
 import os
 
+# Leading bytes needed to recognise every container below
+HEADER_SIZE = 32
+
+
 def detect_container_from_header(path: str) -> str:
     try:
         with open(path, "rb") as f:
-            header = f.read(32)
+            header = f.read(HEADER_SIZE)
     except Exception:
         return ""
 
+    return detect_container(header)
+
+
+def detect_container(header: bytes) -> str:
     if header.startswith(b"fLaC"):
         return "flac"
     if header.startswith(b"RIFF") and b"WAVE" in header:
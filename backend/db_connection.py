@@ -0,0 +1,159 @@
+"""
+Shared SQLite connection setup.
+
+WAL lets read endpoints keep working while apply writes, and
+synchronous=NORMAL drops the per-commit fsync that rollback
+journaling needs (WAL stays crash-consistent at NORMAL).
+
+Connections are pooled per database path so requests reuse an open
+handle (and a warm WAL index) instead of reconnecting each time.
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict
+
+CONNECTION_PRAGMAS = """
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA busy_timeout = 5000;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -64000;
+"""
+
+# Bulk ingest (create_db / analyze_files): larger page cache, mmap'd
+# reads, and fewer WAL checkpoints while a scan writes many batches
+INGEST_PRAGMAS = CONNECTION_PRAGMAS + """
+    PRAGMA cache_size = -131072;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA wal_autocheckpoint = 10000;
+"""
+
+# Prepared-statement cache for ingest connections. Batches reuse the
+# same SQL strings (including one multi-row upsert per tail size), so a
+# larger cache keeps every statement compiled for the whole scan.
+INGEST_CACHED_STATEMENTS = 512
+
+# Idle connections kept per database
+POOL_SIZE = 4
+
+
+def open_db(db_path, *, check_same_thread: bool = True) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, check_same_thread=check_same_thread)
+    conn.executescript(CONNECTION_PRAGMAS)
+    return conn
+
+
+def open_ingest_db(db_path) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, cached_statements=INGEST_CACHED_STATEMENTS)
+    conn.executescript(INGEST_PRAGMAS)
+    return conn
+
+
+def close_db(conn: sqlite3.Connection):
+    # Let SQLite refresh any statistics the session's queries asked for
+    try:
+        conn.execute("PRAGMA optimize")
+    except sqlite3.Error:
+        pass
+    conn.close()
+
+
+def _reset(conn: sqlite3.Connection):
+    # Hand the next borrower a clean connection
+    if conn.in_transaction:
+        conn.rollback()
+    conn.row_factory = None
+
+
+class ConnectionPool:
+    """
+    Per-database pool: up to POOL_SIZE idle shared connections plus one
+    dedicated writer guarded by a lock.
+
+    Borrowing never blocks; if every idle connection is in use a fresh
+    one is opened and closed on return when the pool is full.
+    """
+
+    def __init__(self, db_path: str, size: int = POOL_SIZE):
+        self.db_path = db_path
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=size)
+        self._writer = None
+        self._write_lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        # Pooled connections hop between worker threads, one at a time
+        return open_db(self.db_path, check_same_thread=False)
+
+    def prime(self):
+        while not self._idle.full():
+            try:
+                self._idle.put_nowait(self._open())
+            except queue.Full:
+                break
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._open()
+
+        try:
+            yield conn
+        finally:
+            _reset(conn)
+            try:
+                self._idle.put_nowait(conn)
+            except queue.Full:
+                close_db(conn)
+
+    @contextmanager
+    def write(self):
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._open()
+            try:
+                yield self._writer
+            finally:
+                _reset(self._writer)
+
+    def close(self):
+        while True:
+            try:
+                close_db(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+        with self._write_lock:
+            if self._writer is not None:
+                close_db(self._writer)
+                self._writer = None
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path) -> ConnectionPool:
+    key = str(db_path)
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(key)
+        return pool
+
+
+def close_all_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+
+    for pool in pools:
+        pool.close()
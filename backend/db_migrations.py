@@ -25,8 +25,9 @@ from backend.db_schema_helpers import (
     ensure_mark_delete_column,
     ensure_genres_columns,
     ensure_export_tables,
+    ensure_files_lookup_indexes,
 )
-from backend.db_views import ensure_alias_views
+from backend.db_views import ensure_alias_views, refresh_alias_pairs
 
 def utcnow():
     return datetime.now(timezone.utc).isoformat()
@@ -333,22 +334,25 @@ def migrate_5_to_6(conn):
     )
     from backend.db_views import ensure_alias_views
 
-    ensure_metadata_columns(c)
-    ensure_normalized_columns(c)
-    ensure_export_columns(c)
-    ensure_mark_delete_column(c)
-    ensure_genres_columns(c)
+    # One PRAGMA table_info per table across all the helpers below
+    cols = {}
+
+    ensure_metadata_columns(c, cols)
+    ensure_normalized_columns(c, cols)
+    ensure_export_columns(c, cols)
+    ensure_mark_delete_column(c, cols)
+    ensure_genres_columns(c, cols)
     ensure_export_tables(c)
     ensure_alias_views(c)
 
     from backend.db_schema_helpers import ensure_container_column
-    ensure_container_column(c)
+    ensure_container_column(c, cols)
 
     # ==========================================================
     # FILES PRESENCE TRACKING (idempotent)
     # ==========================================================
-    ensure_column(c, "files", "presence_state", "presence_state TEXT DEFAULT 'present'")
-    ensure_column(c, "files", "last_seen", "last_seen TEXT")
+    ensure_column(c, "files", "presence_state", "presence_state TEXT DEFAULT 'present'", cols)
+    ensure_column(c, "files", "last_seen", "last_seen TEXT", cols)
 
     # Backfill presence_state
     c.execute("""
@@ -359,6 +363,80 @@ def migrate_5_to_6(conn):
 
     conn.commit()
 
+def migrate_6_to_7(conn):
+    """
+    Migration v7
+    Read-path indexes for the API genre filter.
+
+    Adds:
+    - file_genres(genre_id, file_id) covering index (genre → files join)
+    - case-insensitive lookup index on genres(name)
+    """
+
+    c = conn.cursor()
+
+    c.executescript("""
+    CREATE INDEX IF NOT EXISTS idx_file_genres_gid_fid
+        ON file_genres(genre_id, file_id);
+
+    CREATE INDEX IF NOT EXISTS idx_genres_name_nocase
+        ON genres(name COLLATE NOCASE);
+    """)
+
+    conn.commit()
+
+def migrate_7_to_8(conn):
+    """
+    Migration v8
+    Indexes behind delete-candidate selection and alias edge views.
+
+    Views cannot be indexed, so the files columns the alias_pairs_* views
+    self-join on are indexed instead.
+
+    Adds:
+    - partial index on files(id) WHERE mark_delete = 1
+    - files(sha256) / files(fingerprint) (non-null only)
+    - files(artist_norm, title_norm) / files(album_norm, title_norm)
+    """
+
+    c = conn.cursor()
+
+    existing_cols = [r[1] for r in c.execute("PRAGMA table_info(files)")]
+
+    if "mark_delete" not in existing_cols:
+        c.execute("ALTER TABLE files ADD COLUMN mark_delete INTEGER DEFAULT 0")
+
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_files_mark_delete
+            ON files(id) WHERE mark_delete = 1
+    """)
+
+    ensure_files_lookup_indexes(c)
+
+    conn.commit()
+
+def migrate_8_to_9(conn):
+    """
+    Migration v9
+    Materialized alias pairs.
+
+    alias_pairs_all was a UNION ALL over the signal views, re-running
+    every files self-join on each read. It now reads the alias_pairs
+    table, rebuilt after each ingest.
+
+    Adds:
+    - alias_pairs table (+ pair / other_file_id indexes), populated
+    - alias_pairs_all redefined over alias_pairs
+    """
+
+    c = conn.cursor()
+
+    c.execute("DROP VIEW IF EXISTS alias_pairs_all")
+    ensure_alias_views(c)
+    refresh_alias_pairs(c)
+
+    conn.commit()
+
 # Ordered migration chain
 MIGRATIONS = [
     (0, 1, migrate_0_to_1),
@@ -367,8 +445,11 @@ MIGRATIONS = [
     (3, 4, migrate_3_to_4),
     (4, 5, migrate_4_to_5),
     (5, 6, migrate_5_to_6),
+    (6, 7, migrate_6_to_7),
+    (7, 8, migrate_7_to_8),
+    (8, 9, migrate_8_to_9),
 ]
-TARGET_SCHEMA_VERSION = 6
+TARGET_SCHEMA_VERSION = 9
 
 
 # ============================================================
@@ -5,52 +5,105 @@ These are idempotent helpers used by migrations and bootstrapping.
 No runtime logic allowed here.
 """
 
-def ensure_column(c, table, column, ddl):
-    cols = [r["name"] for r in c.execute(f"PRAGMA table_info({table})")]
+def table_columns(c, table, cols_cache=None):
+    """
+    Column names of `table`. With `cols_cache` (a dict shared across a
+    run of ensure_* calls) PRAGMA table_info runs once per table.
+    """
+    if cols_cache is not None and table in cols_cache:
+        return cols_cache[table]
+
+    cols = {r[1] for r in c.execute(f"PRAGMA table_info({table})")}
+    if cols_cache is not None:
+        cols_cache[table] = cols
+    return cols
+
+
+def ensure_column(c, table, column, ddl, cols_cache=None):
+    cols = table_columns(c, table, cols_cache)
     if column not in cols:
         c.execute(f"ALTER TABLE {table} ADD COLUMN {ddl}")
+        cols.add(column)
 
 
 # --------------------------------------------------
 # FILES TABLE EXTENSIONS
 # --------------------------------------------------
 
-def ensure_metadata_columns(c):
-    ensure_column(c, "files", "composer", "composer TEXT")
-    ensure_column(c, "files", "year", "year TEXT")
-    ensure_column(c, "files", "bpm", "bpm INTEGER")
-    ensure_column(c, "files", "disc", "disc TEXT")
-    ensure_column(c, "files", "track_total", "track_total TEXT")
-    ensure_column(c, "files", "disc_total", "disc_total TEXT")
-    ensure_column(c, "files", "comment", "comment TEXT")
-    ensure_column(c, "files", "lyrics", "lyrics TEXT")
-    ensure_column(c, "files", "publisher", "publisher TEXT")
-    ensure_column(c, "files", "quarantined_path", "quarantined_path TEXT")
-    ensure_column(c, "files", "quarantined_at", "quarantined_at TEXT")
-    ensure_column(c, "files", "delete_mode", "delete_mode TEXT DEFAULT 'quarantine'")
+def ensure_metadata_columns(c, cols_cache=None):
+    ensure_column(c, "files", "composer", "composer TEXT", cols_cache)
+    ensure_column(c, "files", "year", "year TEXT", cols_cache)
+    ensure_column(c, "files", "bpm", "bpm INTEGER", cols_cache)
+    ensure_column(c, "files", "disc", "disc TEXT", cols_cache)
+    ensure_column(c, "files", "track_total", "track_total TEXT", cols_cache)
+    ensure_column(c, "files", "disc_total", "disc_total TEXT", cols_cache)
+    ensure_column(c, "files", "comment", "comment TEXT", cols_cache)
+    ensure_column(c, "files", "lyrics", "lyrics TEXT", cols_cache)
+    ensure_column(c, "files", "publisher", "publisher TEXT", cols_cache)
+    ensure_column(c, "files", "quarantined_path", "quarantined_path TEXT", cols_cache)
+    ensure_column(c, "files", "quarantined_at", "quarantined_at TEXT", cols_cache)
+    ensure_column(c, "files", "delete_mode", "delete_mode TEXT DEFAULT 'quarantine'", cols_cache)
 
 
-def ensure_normalized_columns(c):
-    ensure_column(c, "files", "artist_norm", "artist_norm TEXT")
-    ensure_column(c, "files", "album_artist_norm", "album_artist_norm TEXT")
-    ensure_column(c, "files", "album_norm", "album_norm TEXT")
-    ensure_column(c, "files", "title_norm", "title_norm TEXT")
+def ensure_normalized_columns(c, cols_cache=None):
+    ensure_column(c, "files", "artist_norm", "artist_norm TEXT", cols_cache)
+    ensure_column(c, "files", "album_artist_norm", "album_artist_norm TEXT", cols_cache)
+    ensure_column(c, "files", "album_norm", "album_norm TEXT", cols_cache)
+    ensure_column(c, "files", "title_norm", "title_norm TEXT", cols_cache)
 
 
-def ensure_export_columns(c):
-    ensure_column(c, "files", "export_name_cache", "export_name_cache TEXT")
+def ensure_export_columns(c, cols_cache=None):
+    ensure_column(c, "files", "export_name_cache", "export_name_cache TEXT", cols_cache)
 
 
-def ensure_mark_delete_column(c):
-    ensure_column(c, "files", "mark_delete", "mark_delete INTEGER DEFAULT 0")
+def ensure_mark_delete_column(c, cols_cache=None):
+    ensure_column(c, "files", "mark_delete", "mark_delete INTEGER DEFAULT 0", cols_cache)
+
+
+def ensure_files_lookup_indexes(c, cols_cache=None):
+    """
+    Files indexes behind lifecycle/size filters, the alias self-joins
+    and dupe lookups.
+
+    Bulk ingests drop these for the duration of the scan, so this also
+    runs at every ingest start: a scan killed mid-run must not leave
+    the database without them.
+    """
+    cols = table_columns(c, "files", cols_cache)
+
+    c.execute("CREATE INDEX IF NOT EXISTS idx_files_lifecycle ON files(lifecycle_state)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_files_size ON files(size_bytes)")
+
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_files_sha256
+            ON files(sha256) WHERE sha256 IS NOT NULL
+    """)
+
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_files_fingerprint
+            ON files(fingerprint) WHERE fingerprint IS NOT NULL
+    """)
+
+    # Normalized columns arrive with the scanner schema, not with v1
+    if {"artist_norm", "title_norm"} <= cols:
+        c.execute("""
+            CREATE INDEX IF NOT EXISTS idx_files_artist_title_norm
+                ON files(artist_norm, title_norm)
+        """)
+
+    if {"album_norm", "title_norm"} <= cols:
+        c.execute("""
+            CREATE INDEX IF NOT EXISTS idx_files_album_title_norm
+                ON files(album_norm, title_norm)
+        """)
 
 
 # --------------------------------------------------
 # GENRES
 # --------------------------------------------------
 
-def ensure_genres_columns(c):
-    ensure_column(c, "genres", "active", "active INTEGER DEFAULT 1")
+def ensure_genres_columns(c, cols_cache=None):
+    ensure_column(c, "genres", "active", "active INTEGER DEFAULT 1", cols_cache)
 
 
 # --------------------------------------------------
@@ -85,10 +138,10 @@ def ensure_export_tables(c):
         )
     """)
 
-def ensure_container_column(c):
+def ensure_container_column(c, cols_cache=None):
     # Only ensure column if files table exists
     tables = {r[0] for r in c.execute(
         "SELECT name FROM sqlite_master WHERE type='table'"
     )}
     if "files" in tables:
-        ensure_column(c, "files", "detected_container", "detected_container TEXT")
\ No newline at end of file
+        ensure_column(c, "files", "detected_container", "detected_container TEXT", cols_cache)
\ No newline at end of file
@@ -1,6 +1,7 @@
 # backend/db_state.py
 
 import json
+import os
 from pathlib import Path
 from sys import path
 from backend.paths import BASE_CONFIG_DIR
@@ -8,6 +9,10 @@ from backend.paths import BASE_CONFIG_DIR
 CONFIG_DIR = Path(BASE_CONFIG_DIR)
 ACTIVE_DB_FILE = CONFIG_DIR / "active_db.json"
 
+# get_db resolves the active DB on every request; re-read the file only
+# when its stat signature (mtime, size) changes.
+_cache = {"sig": None, "value": None}
+
 
 def set_active_db(db_path: str):
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
@@ -17,6 +22,7 @@ def set_active_db(db_path: str):
 
     with open(ACTIVE_DB_FILE, "w", encoding="utf-8") as f:
         json.dump({"db_path": db_path}, f)
+    _cache["sig"] = None
 
     # Backward compatibility: update .env
     from dotenv import set_key
@@ -25,12 +31,24 @@ def set_active_db(db_path: str):
 
 
 def get_active_db() -> str | None:
-    if not ACTIVE_DB_FILE.exists():
+    try:
+        st = os.stat(ACTIVE_DB_FILE)
+    except FileNotFoundError:
         return None
+
+    sig = (st.st_mtime_ns, st.st_size)
+    if sig == _cache["sig"]:
+        return _cache["value"]
+
     with open(ACTIVE_DB_FILE, "r", encoding="utf-8") as f:
-        return json.load(f).get("db_path")
+        value = json.load(f).get("db_path")
+
+    _cache["value"] = value
+    _cache["sig"] = sig
+    return value
 
 
 def clear_active_db():
     if ACTIVE_DB_FILE.exists():
         ACTIVE_DB_FILE.unlink()
+    _cache["sig"] = None
@@ -1,9 +1,134 @@
 """
 Database views used for alias clustering.
 Pure SQL definitions.
+
+The per-signal alias_pairs_* views self-join files, so their rows are
+materialized into the alias_pairs table (see refresh_alias_pairs);
+alias_pairs_all and everything above it read the table instead of
+re-running the joins.
+
+Refresh contract — alias_pairs is only as fresh as its last writer:
+- anything that rewrites the signal columns (sha256, fingerprint,
+  *_norm) calls refresh_alias_pairs in the same transaction: ingest
+  (analyze_files), normalize-only mode (renormalize_files), the schema
+  migration that introduces the table, and norm backfills
+- anything that deletes file rows calls prune_alias_pairs with the
+  deleted ids (api apply_deletions)
+- edits to other columns (paths, status, mark_delete) never affect pairs
 """
 
+import json
+
+# Signal views feeding the alias_pairs table (those present are used)
+ALIAS_SIGNAL_VIEWS = (
+    "alias_pairs_sha256",
+    "alias_pairs_fingerprint",
+    "alias_pairs_artist_title",
+    "alias_pairs_album_title",
+)
+
+
+def ensure_alias_pairs_table(c):
+    c.execute("""
+        CREATE TABLE IF NOT EXISTS alias_pairs (
+            file_id INTEGER NOT NULL,
+            other_file_id INTEGER NOT NULL,
+            signal_type TEXT NOT NULL,
+            strength REAL NOT NULL
+        )
+    """)
+
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_alias_pairs_pair
+            ON alias_pairs(file_id, other_file_id)
+    """)
+
+    c.execute("""
+        CREATE INDEX IF NOT EXISTS idx_alias_pairs_other
+            ON alias_pairs(other_file_id)
+    """)
+
+
+def refresh_alias_pairs(c):
+    """
+    Rebuild alias_pairs from the signal views.
+    Runs in the caller's transaction.
+    """
+    ensure_alias_pairs_table(c)
+
+    views = [
+        r[0] for r in c.execute(
+            f"""
+            SELECT name FROM sqlite_master
+            WHERE type = 'view'
+              AND name IN ({",".join("?" * len(ALIAS_SIGNAL_VIEWS))})
+            """,
+            ALIAS_SIGNAL_VIEWS,
+        ).fetchall()
+    ]
+
+    c.execute("DELETE FROM alias_pairs")
+
+    # Keep the canonical signal order regardless of sqlite_master order
+    for view in ALIAS_SIGNAL_VIEWS:
+        if view in views:
+            c.execute(f"""
+                INSERT INTO alias_pairs (file_id, other_file_id, signal_type, strength)
+                SELECT file_id, other_file_id, signal_type, strength
+                FROM {view}
+            """)
+
+
+def prune_alias_pairs(c, file_ids):
+    """
+    Drop materialized pairs that touch deleted files.
+    No-op until alias_pairs exists.
+    """
+    exists = c.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'alias_pairs'"
+    ).fetchone()
+
+    if not exists:
+        return
+
+    ids_json = json.dumps(list(file_ids))
+
+    c.execute("""
+        DELETE FROM alias_pairs
+        WHERE file_id IN (SELECT value FROM json_each(?))
+           OR other_file_id IN (SELECT value FROM json_each(?))
+    """, (ids_json, ids_json))
+
+
+# Objects created by ensure_alias_views
+ALIAS_VIEWS = (
+    "alias_pairs_sha256",
+    "alias_pairs_fingerprint",
+    "alias_pairs_all",
+    "alias_pair_confidence",
+    "alias_strong_edges",
+)
+
+
+def alias_views_present(c) -> bool:
+    names = ALIAS_VIEWS + ("alias_pairs",)
+    found = c.execute(
+        f"""
+        SELECT COUNT(*) FROM sqlite_master
+        WHERE type IN ('view', 'table')
+          AND name IN ({",".join("?" * len(names))})
+        """,
+        names,
+    ).fetchone()[0]
+    return found == len(names)
+
+
 def ensure_alias_views(c):
+    # Called on every dupes request: one catalog lookup instead of a
+    # CREATE ... IF NOT EXISTS round per object once everything exists
+    if alias_views_present(c):
+        return
+
     # --------------------------------------------------
     # Base pair signals
     # --------------------------------------------------
@@ -25,14 +150,15 @@ def ensure_alias_views(c):
     """)
 
     # --------------------------------------------------
-    # Union of all signals
+    # Union of all signals (materialized)
     # --------------------------------------------------
 
+    ensure_alias_pairs_table(c)
+
     c.execute("""
         CREATE VIEW IF NOT EXISTS alias_pairs_all AS
-        SELECT * FROM alias_pairs_sha256
-        UNION ALL
-        SELECT * FROM alias_pairs_fingerprint
+        SELECT file_id, other_file_id, signal_type, strength
+        FROM alias_pairs
     """)
 
     # --------------------------------------------------
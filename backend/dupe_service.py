@@ -15,12 +15,21 @@ No DB writes (for now).
 from __future__ import annotations
 from typing import List, Dict, Any
 import sqlite3
+import json
 import os
 
 
 from backend.cluster_service import build_duplicate_clusters
 from backend.db_views import ensure_alias_views
 
+# Members are bound as one JSON array, so the statement text is the same
+# for every cluster size and SQLite's statement cache keeps hitting.
+CLUSTER_FILES_SQL = """
+    SELECT id, original_path, size_bytes, detected_container
+    FROM files
+    WHERE id IN (SELECT value FROM json_each(?))
+"""
+
 def _ensure_alias_views(conn):
     try:
         ensure_alias_views(conn)
@@ -177,12 +186,8 @@ def suggest_primary(
 
     c = conn.cursor()
     rows = c.execute(
-        f"""
-        SELECT id, original_path, size_bytes, detected_container
-        FROM files
-        WHERE id IN ({",".join("?" for _ in cluster["members"])})
-        """,
-        cluster["members"],
+        CLUSTER_FILES_SQL,
+        (json.dumps(cluster["members"]),),
     ).fetchall()
 
     LOSSLESS = {"flac", "wav", "aiff", "alac"}
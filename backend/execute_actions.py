@@ -32,6 +32,7 @@ import json
 from dotenv import load_dotenv
 
 from backend.config_service import ensure_quarantine_exists
+from backend.db_connection import open_db, close_db
 
 
 # Optional album art normalization
@@ -96,7 +97,7 @@ def log(key, **kwargs):
     print(f"[{utcnow()}] {text}")
 
 def connect_db(path):
-    conn = sqlite3.connect(path)
+    conn = open_db(path)
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -394,7 +395,7 @@ def execute_actions(
             
             summary["errors"] += 1
 
-    conn.close()
+    close_db(conn)
 
     log("EXEC_FINISHED")
     for k, v in summary.items():
@@ -1,13 +1,17 @@
-import re
 from pathlib import Path
 
+# Characters not allowed in path components, each mapped to "_"
+_FS_BAD = str.maketrans(
+    dict.fromkeys('<>:"/\\|?*' + "".join(map(chr, range(0x20))), "_")
+)
+
 
 def safe_component(value: str) -> str:
     if not value:
         return "Unknown"
 
     value = value.strip()
-    value = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "_", value)
+    value = value.translate(_FS_BAD)
     return value[:120]
 
 
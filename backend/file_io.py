@@ -0,0 +1,40 @@
+"""
+Crash-safe file writes.
+
+Content goes to a temp file in the target's directory and is moved into
+place with os.replace, so readers see either the old file or the new
+one, never a partially written one. The replacement keeps the old
+file's permission bits (mkstemp would otherwise leave it 0600).
+"""
+
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_writer(path, mode: str = "wb", *, fsync: bool = True, **open_kwargs):
+    path = os.fspath(path)
+    directory, name = os.path.split(path)
+
+    try:
+        file_mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        file_mode = 0o644
+
+    fd, tmp = tempfile.mkstemp(dir=directory or ".", prefix=f".{name}.", suffix=".tmp")
+    try:
+        os.chmod(tmp, file_mode)
+        with os.fdopen(fd, mode, **open_kwargs) as f:
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
@@ -264,6 +264,8 @@ def normalize_genres_by_ids(
     # -------------------------------------------------
     # 4. Apply: link files to canonical genre
     # -------------------------------------------------
+    now = utcnow()
+
     for fid in file_ids:
         c.execute(
             """
@@ -272,7 +274,7 @@ def normalize_genres_by_ids(
             )
             VALUES (?, ?, 'normalize', 1.0, ?)
             """,
-            (fid, target_genre_id, utcnow()),
+            (fid, target_genre_id, now),
         )
 
     # -------------------------------------------------
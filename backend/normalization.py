@@ -1,4 +1,6 @@
+import functools
 import re
+import sys
 import unicodedata
 from typing import Optional
 
@@ -27,12 +29,38 @@ TRANSLITERATION_MAP = {
     "Ð": "d",
 }
 
+
+@functools.lru_cache(maxsize=None)
+def combining_marks_table() -> dict:
+    """
+    str.translate table deleting every Unicode combining mark.
+
+    Built once on first use (a single pass over all code points), so
+    mark stripping runs in C instead of a per-character Python loop.
+    """
+    return dict.fromkeys(
+        i for i in range(sys.maxunicode + 1)
+        if unicodedata.combining(chr(i))
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _normalize_table() -> dict:
+    # Combining-mark removal plus the v0 transliteration in one pass
+    table = dict(combining_marks_table())
+    table.update({ord(src): dst for src, dst in TRANSLITERATION_MAP.items()})
+    return table
+
+
 RE_PUNCTUATION = re.compile(r"[\"'.,:;!?()\[\]{}]")
 RE_SEPARATORS = re.compile(r"[-_/]")
 RE_WHITESPACE = re.compile(r"\s+")
 RE_DIGITS_ONLY = re.compile(r"^\d+$")
 
 
+# Artist/album strings repeat across whole albums and libraries, and the
+# ingest's stale-norm check evaluates each value twice
+@functools.lru_cache(maxsize=65536)
 def normalize_text(value: Optional[str]) -> str:
     """
     Base normalization function (v0).
@@ -47,12 +75,8 @@ def normalize_text(value: Optional[str]) -> str:
     # ---- Unicode normalization ----
     text = unicodedata.normalize("NFKD", value)
 
-    # Remove combining marks
-    text = "".join(c for c in text if not unicodedata.combining(c))
-
-    # Apply minimal transliteration
-    for src, dst in TRANSLITERATION_MAP.items():
-        text = text.replace(src, dst)
+    # Remove combining marks and apply minimal transliteration
+    text = text.translate(_normalize_table())
 
     # Drop remaining non-ASCII
     text = text.encode("ascii", "ignore").decode("ascii")
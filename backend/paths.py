@@ -79,6 +79,11 @@ SCAN_LOCK_PATH = os.path.join(
     "scan.lock"
 )
 
+# Background scan job state (one JSON sidecar per job)
+SCAN_JOBS_DIR = ensure_dir(
+    os.path.join(BASE_CONFIG_DIR, "scan_jobs")
+)
+
 def auto_diagnostic_path():
     """
     Generate a timestamped diagnostic report path.
@@ -2,6 +2,8 @@ import os
 import json
 from datetime import datetime, timezone
 
+from backend.file_io import atomic_writer
+
 LAST_RUN_PLAN_PATH = os.path.expanduser("~/.config/pedro/last_run_plan.json")
 
 def utcnow():
@@ -16,7 +18,7 @@ def save_last_run_plan(plan: dict):
         "plan": plan,
     }
 
-    with open(LAST_RUN_PLAN_PATH, "w", encoding="utf-8") as f:
+    with atomic_writer(LAST_RUN_PLAN_PATH, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
 
 
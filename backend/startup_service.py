@@ -335,6 +335,7 @@ def rescan_pedro_db(payload: Dict[str, Any]) -> Dict[str, Any]:
         db_path=db_path,
         db_mode=db_mode,
         progress=progress,
+        no_overwrite=bool(payload.get("no_overwrite", True)),
     )
 
     return {
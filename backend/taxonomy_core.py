@@ -8,6 +8,8 @@ import re
 # helpers
 # =============================
 
+_TOKEN_SEP = re.compile(r"[;,/]")
+
 def utcnow():
     return datetime.now(timezone.utc).isoformat()
 
@@ -19,7 +21,7 @@ def split_tokens(raw: str):
     """
     if not raw:
         return []
-    return [t.strip() for t in re.split(r"[;,/]", raw) if t.strip()]
+    return [t.strip() for t in _TOKEN_SEP.split(raw) if t.strip()]
 
 def normalize_token(token: str) -> str:
     return " ".join(token.strip().lower().split())
@@ -174,6 +176,8 @@ def normalize_canonical(
     stats["files_affected"] = len(file_ids)
 
     # ---- apply changes ----
+    now = utcnow()
+
     for file_id in file_ids:
 
         if clear_previous:
@@ -197,7 +201,7 @@ def normalize_canonical(
                 ({spec['file_link_file_id']}, {spec['file_link_taxonomy_id']}, source, confidence, created_at)
                 VALUES (?, ?, 'normalize', 1.0, ?)
                 """,
-                (file_id, target_id, utcnow()),
+                (file_id, target_id, now),
             )
             stats["links_added"] += c.rowcount
         else:
@@ -285,6 +289,8 @@ def taxonomy_for_selection(conn, spec, file_ids):
 
     placeholders = ",".join("?" for _ in file_ids)
 
+    # One round trip: hit counts and applied/partial/available
+    # classification are both computed in SQL.
     rows = c.execute(
         f"""
         WITH hits AS (
@@ -298,8 +304,11 @@ def taxonomy_for_selection(conn, spec, file_ids):
         SELECT
             t.{spec['canonical_id']} AS id,
             t.{spec['canonical_name']} AS name,
-            h.hit_count,
-            ? AS total
+            CASE
+                WHEN h.hit_count IS NULL THEN 'available'
+                WHEN h.hit_count = ? THEN 'applied'
+                ELSE 'partial'
+            END AS bucket
         FROM {spec['canonical_table']} t
         LEFT JOIN hits h ON h.taxonomy_id = t.{spec['canonical_id']}
         ORDER BY t.{spec['canonical_name']}
@@ -308,16 +317,14 @@ def taxonomy_for_selection(conn, spec, file_ids):
     ).fetchall()
 
     applied, partial, available = [], [], []
+    buckets = {
+        "applied": applied,
+        "partial": partial,
+        "available": available,
+    }
 
     for r in rows:
-        entry = {"id": r["id"], "name": r["name"]}
-
-        if r["hit_count"] is None:
-            available.append(entry)
-        elif r["hit_count"] == r["total"]:
-            applied.append(entry)
-        else:
-            partial.append(entry)
+        buckets[r["bucket"]].append({"id": r["id"], "name": r["name"]})
 
     return {
         "applied": applied,
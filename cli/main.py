@@ -124,7 +124,12 @@ def main():
     analyze.add_argument(
         "--no-overwrite",
         action="store_true",
-        help="Do not overwrite existing metadata"
+        help="Do not overwrite existing metadata (default)"
+    )
+    analyze.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Replace stored metadata with the tags read from files"
     )
 
     # ---------------- PREVIEW ----------------
@@ -500,7 +505,7 @@ def main():
             with_fingerprint=args.with_fingerprint,
             search_covers=args.search_covers,
             db_mode=args.db_mode,
-            no_overwrite=args.no_overwrite,
+            no_overwrite=not args.overwrite,
         )
         return
 
@@ -335,6 +335,9 @@ export default {
   SRC_NOT_FOUND: "Source folder not found.",
   LIB_NOT_FOUND: "Target folder not found.",
   SCAN_ALREADY_RUNNING: "A scan is already running.",
+  SCAN_INTERRUPTED: "The scan was interrupted before it finished.",
+  SCAN_POLL_TIMEOUT: "Gave up waiting for the scan to finish.",
+  SCAN_START_FAILED: "The scan could not be started.",
   DRY_RUN_NOT_SUPPORTED_YET: "Dry-run is not supported yet.",
   STARTUP_SCAN_INVALID_PLAN: "Invalid execution plan. Please go back and review your settings.",
 
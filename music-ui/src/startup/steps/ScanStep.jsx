@@ -2,6 +2,11 @@ import { useState, useEffect } from "react";
 import { t } from "../../i18n";
 
 const API_BASE = "http://127.0.0.1:8000";
+const SCAN_POLL_MS = 1000;
+// Give up after this many failed polls in a row (server gone)
+const SCAN_POLL_MAX_FAILURES = 10;
+// Hard ceiling on waiting for a single scan
+const SCAN_POLL_TIMEOUT_MS = 12 * 60 * 60 * 1000;
 
 export default function ScanStep({ executionPlan, onBack, onDone }) {
   const [status, setStatus] = useState("idle");   // idle | running | success | error
@@ -25,6 +30,37 @@ export default function ScanStep({ executionPlan, onBack, onDone }) {
     return () => clearInterval(timer);
   }, [status]);
 
+  const pollScanJob = async (jobId) => {
+    const deadline = Date.now() + SCAN_POLL_TIMEOUT_MS;
+    let failures = 0;
+
+    while (Date.now() < deadline) {
+      await new Promise((resolve) => setTimeout(resolve, SCAN_POLL_MS));
+
+      let data;
+      try {
+        const res = await fetch(`${API_BASE}/startup/scan-status/${jobId}`);
+        if (!res.ok) {
+          throw new Error(`HTTP ${res.status}`);
+        }
+        data = await res.json();
+      } catch (err) {
+        failures += 1;
+        if (failures >= SCAN_POLL_MAX_FAILURES) {
+          throw err;
+        }
+        continue;
+      }
+
+      failures = 0;
+      if (data.status !== "ok" || data.job?.state !== "running") {
+        return data;
+      }
+    }
+
+    return { status: "error", error: "SCAN_POLL_TIMEOUT" };
+  };
+
   const runScan = async () => {
     setErrorKey(null);
     setErrorDetails(null);
@@ -43,17 +79,28 @@ export default function ScanStep({ executionPlan, onBack, onDone }) {
         throw new Error(`HTTP ${res.status}`);
       }
 
-      const data = await res.json();
+      const started = await res.json();
+
+      if (started.status !== "started") {
+        setStatus("error");
+        setErrorKey(started.error || "STARTUP_SCAN_FAILED");
+        setErrorDetails(started.details || null);
+        return;
+      }
+
+      // ===== Poll background scan job =====
+      const data = await pollScanJob(started.job_id);
+      const job = data.job || {};
 
-      if (data.status !== "ok") {
+      if (data.status !== "ok" || job.state === "error") {
         setStatus("error");
-        setErrorKey(data.error || "STARTUP_SCAN_FAILED");
-        setErrorDetails(data.details || null);
+        setErrorKey(job.error || data.error || "STARTUP_SCAN_FAILED");
+        setErrorDetails(job.details || null);
         return;
       }
 
       // ===== DRY-RUN SUCCESS =====
-      if (data.mode === "dry-run") {
+      if (job.mode === "dry-run") {
         setStatus("success");
 
         setTimeout(() => {
@@ -0,0 +1,50 @@
+import os
+import stat
+
+import pytest
+
+from backend.file_io import atomic_writer
+
+
+def test_writes_new_file(tmp_path):
+    target = tmp_path / "out.json"
+
+    with atomic_writer(target) as f:
+        f.write(b"{}")
+
+    assert target.read_bytes() == b"{}"
+    assert stat.S_IMODE(os.stat(target).st_mode) == 0o644
+
+
+def test_text_mode(tmp_path):
+    target = tmp_path / "out.txt"
+
+    with atomic_writer(target, "w", encoding="utf-8") as f:
+        f.write("héllo")
+
+    assert target.read_text(encoding="utf-8") == "héllo"
+
+
+def test_replaces_existing_file_keeping_permissions(tmp_path):
+    target = tmp_path / "out.json"
+    target.write_bytes(b"old")
+    os.chmod(target, 0o640)
+
+    with atomic_writer(target, fsync=False) as f:
+        f.write(b"new")
+
+    assert target.read_bytes() == b"new"
+    assert stat.S_IMODE(os.stat(target).st_mode) == 0o640
+
+
+def test_failure_keeps_old_content_and_leaves_no_temp(tmp_path):
+    target = tmp_path / "out.json"
+    target.write_bytes(b"old")
+
+    with pytest.raises(RuntimeError):
+        with atomic_writer(target) as f:
+            f.write(b"half")
+            raise RuntimeError("crash")
+
+    assert target.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["out.json"]
@@ -0,0 +1,128 @@
+import backend.consolidate_music as cm
+from backend.normalization import normalize_text
+from backend.consolidate_music import (
+    FILES_UPSERT_COLUMNS,
+    FILES_UPSERT_NORM_SOURCES,
+    create_db,
+    ensure_column,
+    flush_ingest_batch,
+)
+
+
+def open_db(tmp_path):
+    # Same schema analyze_files ingests into
+    conn = create_db(str(tmp_path / "t.db"))
+    ensure_column(conn.cursor(), "files", "mtime_ns", "mtime_ns INTEGER")
+    ensure_column(conn.cursor(), "files", "detected_container", "detected_container TEXT")
+    conn.commit()
+    return conn
+
+
+def row(path, rescanned=True, **fields):
+    """Upsert values as analyze_files builds them; `rescanned=False` is
+    an unchanged file (NULL tags and norms)."""
+    values = dict.fromkeys(FILES_UPSERT_COLUMNS)
+    values.update(
+        original_path=path,
+        size_bytes=1,
+        mtime_ns=1,
+        lifecycle_state="new",
+        first_seen="t0",
+        last_update="t0",
+    )
+    values.update(fields)
+    if rescanned:
+        for tag in FILES_UPSERT_NORM_SOURCES:
+            values[f"{tag}_norm"] = normalize_text(values[tag])
+    return tuple(values[c] for c in FILES_UPSERT_COLUMNS)
+
+
+def entry(path, **fields):
+    return row(path, **fields), f"/lib/{path}", None, "t0"
+
+
+def stored(conn):
+    return {
+        r["original_path"]: dict(r)
+        for r in conn.execute("SELECT * FROM files")
+    }
+
+
+def test_upsert_inserts_rows_and_norms(tmp_path):
+    conn = open_db(tmp_path)
+
+    flush_ingest_batch(conn, [
+        entry("a.mp3", artist="Björk", title="Jóga"),
+        entry("b.mp3", artist="AC-DC"),
+    ])
+
+    rows = stored(conn)
+    assert rows["a.mp3"]["artist_norm"] == "bjork"
+    assert rows["a.mp3"]["title_norm"] == "joga"
+    assert rows["b.mp3"]["artist_norm"] == "ac dc"
+
+
+def test_null_tags_keep_stored_values(tmp_path):
+    conn = open_db(tmp_path)
+
+    flush_ingest_batch(conn, [entry("a.mp3", artist="Abba", sha256="s1")])
+    first_id = stored(conn)["a.mp3"]["id"]
+
+    flush_ingest_batch(conn, [entry("a.mp3", rescanned=False, mtime_ns=2)])
+
+    r = stored(conn)["a.mp3"]
+    assert r["id"] == first_id
+    assert r["artist"] == "Abba"
+    assert r["artist_norm"] == "abba"
+    assert r["sha256"] == "s1"
+    assert r["mtime_ns"] == 2
+
+
+def test_existing_tags_kept_unless_overwrite(tmp_path):
+    conn = open_db(tmp_path)
+
+    flush_ingest_batch(conn, [entry("a.mp3", artist="Old")])
+    flush_ingest_batch(conn, [entry("a.mp3", artist="New")])
+    assert stored(conn)["a.mp3"]["artist"] == "Old"
+
+    flush_ingest_batch(conn, [entry("a.mp3", artist="New")], overwrite=True)
+    assert stored(conn)["a.mp3"]["artist_norm"] == "new"
+
+
+def test_multi_statement_batch_maps_every_id(tmp_path, monkeypatch):
+    # Force several INSERT statements plus a shorter tail
+    monkeypatch.setattr(cm, "FILES_UPSERT_ROWS", 2)
+    conn = open_db(tmp_path)
+
+    flush_ingest_batch(conn, [entry("a.mp3")])
+    paths = [f"{c}.mp3" for c in "abcde"]
+
+    flush_ingest_batch(
+        conn, [entry(p) for p in paths], create_actions=True
+    )
+
+    rows = stored(conn)
+    assert sorted(rows) == paths
+
+    # Move actions only for paths that were new, each with its own id
+    actions = conn.execute(
+        "SELECT file_id, src_path, dst_path FROM actions ORDER BY src_path"
+    ).fetchall()
+    assert [tuple(a) for a in actions] == [
+        (rows[p]["id"], p, f"/lib/{p}") for p in paths[1:]
+    ]
+
+
+def test_returning_and_reselect_paths_agree(tmp_path, monkeypatch):
+    monkeypatch.setattr(cm, "UPSERT_RETURNING", False)
+    cm.files_upsert_sql.cache_clear()
+    try:
+        conn = open_db(tmp_path)
+        flush_ingest_batch(
+            conn, [entry("a.mp3"), entry("b.mp3")], create_actions=True
+        )
+        ids = {p: r["id"] for p, r in stored(conn).items()}
+        actions = dict(conn.execute("SELECT src_path, file_id FROM actions"))
+        assert actions == ids
+    finally:
+        cm.files_upsert_sql.cache_clear()
@@ -0,0 +1,86 @@
+import os
+import sqlite3
+
+from backend.consolidate_music import load_unchanged_files
+
+
+def make_db(rows):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("""
+        CREATE TABLE files (
+            original_path TEXT, size_bytes INTEGER,
+            mtime_ns INTEGER, sha256 TEXT
+        )
+    """)
+    conn.executemany("INSERT INTO files VALUES (?, ?, ?, ?)", rows)
+    return conn
+
+
+def stat_of(path):
+    return os.stat(path)
+
+
+def test_matching_size_and_mtime_is_unchanged(tmp_path):
+    f = tmp_path / "a.mp3"
+    f.write_bytes(b"x" * 10)
+    st = stat_of(f)
+
+    conn = make_db([(str(f), st.st_size, st.st_mtime_ns, "abc")])
+
+    assert load_unchanged_files(conn, tmp_path, {str(f): st}) == {str(f): "abc"}
+
+
+def test_size_or_mtime_change_is_rescanned(tmp_path):
+    f = tmp_path / "a.mp3"
+    f.write_bytes(b"x" * 10)
+    st = stat_of(f)
+
+    conn = make_db([(str(f), st.st_size + 1, st.st_mtime_ns, "abc")])
+    assert load_unchanged_files(conn, tmp_path, {str(f): st}) == {}
+
+    conn = make_db([(str(f), st.st_size, st.st_mtime_ns - 1, "abc")])
+    assert load_unchanged_files(conn, tmp_path, {str(f): st}) == {}
+
+
+def test_missing_digest_only_counts_without_sha256(tmp_path):
+    f = tmp_path / "a.mp3"
+    f.write_bytes(b"x")
+    st = stat_of(f)
+
+    conn = make_db([(str(f), st.st_size, st.st_mtime_ns, None)])
+
+    assert load_unchanged_files(conn, tmp_path, {str(f): st}) == {}
+    assert load_unchanged_files(
+        conn, tmp_path, {str(f): st}, need_sha256=False
+    ) == {str(f): None}
+
+
+def test_rows_outside_root_or_undiscovered_are_ignored(tmp_path):
+    root = tmp_path / "lib"
+    root.mkdir()
+    f = root / "a.mp3"
+    f.write_bytes(b"x")
+    st = stat_of(f)
+
+    # "lib2" shares the prefix but is a sibling directory
+    sibling = str(tmp_path / "lib2" / "a.mp3")
+    gone = str(root / "gone.mp3")
+
+    conn = make_db([
+        (str(f), st.st_size, st.st_mtime_ns, "abc"),
+        (sibling, st.st_size, st.st_mtime_ns, "def"),
+        (gone, st.st_size, st.st_mtime_ns, "ghi"),
+    ])
+
+    stats = {str(f): st, sibling: st}
+    assert load_unchanged_files(conn, root, stats) == {str(f): "abc"}
+
+
+def test_legacy_rows_without_mtime_are_rescanned(tmp_path):
+    f = tmp_path / "a.mp3"
+    f.write_bytes(b"x")
+    st = stat_of(f)
+
+    conn = make_db([(str(f), st.st_size, None, "abc")])
+
+    assert load_unchanged_files(conn, tmp_path, {str(f): st}) == {}
@@ -0,0 +1,79 @@
+import sqlite3
+
+import pytest
+
+import api
+from backend.db_views import ensure_alias_pairs_table
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE files (id INTEGER PRIMARY KEY)")
+    conn.executemany("INSERT INTO files VALUES (?)", [(i,) for i in range(1, 6)])
+    ensure_alias_pairs_table(conn.cursor())
+    conn.executemany(
+        "INSERT INTO alias_pairs VALUES (?, ?, 'sha256', 1.0)",
+        [(1, 2), (2, 5), (3, 4), (4, 5)],
+    )
+    conn.commit()
+    return conn
+
+
+def plan_for(tmp_path, ids, undeletable=()):
+    plan = []
+    for i in ids:
+        p = tmp_path / f"{i}.mp3"
+        if i in undeletable:
+            # unlink() refuses directories, even for root
+            p.mkdir()
+        else:
+            p.write_bytes(b"x")
+        plan.append(api.ApplyFileResult(
+            file_id=i, original_path=str(p),
+            planned_action="delete", status="pending",
+        ))
+    return plan
+
+
+def remaining(conn):
+    files = [r[0] for r in conn.execute("SELECT id FROM files ORDER BY id")]
+    pairs = conn.execute(
+        "SELECT file_id, other_file_id FROM alias_pairs ORDER BY 1, 2"
+    ).fetchall()
+    return files, pairs
+
+
+@pytest.mark.parametrize("atomic", [False, True])
+def test_deleted_rows_and_their_pairs_are_removed(tmp_path, conn, monkeypatch, atomic):
+    # Several chunks plus a partial tail
+    monkeypatch.setattr(api, "DELETE_CHUNK_SIZE", 2)
+    plan = plan_for(tmp_path, [1, 2, 3])
+
+    api.apply_deletions(conn, plan, atomic=atomic)
+
+    assert [p.status for p in plan] == ["deleted"] * 3
+    assert not any((tmp_path / f"{i}.mp3").exists() for i in (1, 2, 3))
+    assert remaining(conn) == ([4, 5], [(4, 5)])
+
+
+def test_failed_unlink_keeps_row_and_pairs(tmp_path, conn, monkeypatch):
+    monkeypatch.setattr(api, "DELETE_CHUNK_SIZE", 2)
+    plan = plan_for(tmp_path, [1, 3], undeletable={3})
+
+    api.apply_deletions(conn, plan, atomic=False)
+
+    assert plan[0].status == "deleted"
+    assert plan[1].status == "failed"
+    assert plan[1].error
+    assert remaining(conn) == ([2, 3, 4, 5], [(2, 5), (3, 4), (4, 5)])
+
+
+def test_without_alias_pairs_table(tmp_path):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE files (id INTEGER PRIMARY KEY)")
+    conn.execute("INSERT INTO files VALUES (1)")
+
+    api.apply_deletions(conn, plan_for(tmp_path, [1]), atomic=False)
+
+    assert conn.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 0
@@ -0,0 +1,92 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+
+SIZE = 1000
+
+
+@pytest.fixture
+def client(tmp_path):
+    audio = tmp_path / "a.mp3"
+    audio.write_bytes(bytes(range(256)) * 3 + bytes(SIZE - 768))
+
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("CREATE TABLE files (id INTEGER PRIMARY KEY, original_path TEXT)")
+    conn.execute("INSERT INTO files VALUES (1, ?)", (str(audio),))
+
+    api.app.dependency_overrides[api.get_db] = lambda: conn
+    try:
+        yield TestClient(api.app), audio.read_bytes()
+    finally:
+        api.app.dependency_overrides.pop(api.get_db, None)
+
+
+def get(client, range_header=None):
+    headers = {"Range": range_header} if range_header else {}
+    return client.get("/audio/1", headers=headers)
+
+
+def test_no_range_streams_whole_file(client):
+    c, data = client
+    r = get(c)
+    assert r.status_code == 200
+    assert r.headers["accept-ranges"] == "bytes"
+    assert r.content == data
+
+
+def test_explicit_range(client):
+    c, data = client
+    r = get(c, "bytes=10-19")
+    assert r.status_code == 206
+    assert r.headers["content-range"] == f"bytes 10-19/{SIZE}"
+    assert r.content == data[10:20]
+
+
+def test_open_ended_range(client):
+    c, data = client
+    r = get(c, "bytes=990-")
+    assert r.status_code == 206
+    assert r.content == data[990:]
+
+
+def test_end_past_eof_is_clamped(client):
+    c, data = client
+    r = get(c, "bytes=900-5000")
+    assert r.headers["content-range"] == f"bytes 900-999/{SIZE}"
+    assert r.content == data[900:]
+
+
+def test_suffix_range_is_last_n_bytes(client):
+    c, data = client
+    r = get(c, "bytes=-100")
+    assert r.status_code == 206
+    assert r.headers["content-range"] == f"bytes 900-999/{SIZE}"
+    assert r.content == data[-100:]
+
+
+def test_suffix_longer_than_file_returns_everything(client):
+    c, data = client
+    r = get(c, "bytes=-5000")
+    assert r.headers["content-range"] == f"bytes 0-999/{SIZE}"
+    assert r.content == data
+
+
+@pytest.mark.parametrize("header", [
+    "bytes=1000-",      # starts at EOF
+    "bytes=50-10",      # end before start
+    "bytes=-",          # neither bound
+    "bytes=1-2,5-6",    # multiple ranges
+    "items=0-1",        # unknown unit
+])
+def test_unsatisfiable_or_malformed_range_is_416(client, header):
+    c, _ = client
+    assert get(c, header).status_code == 416
+
+
+def test_unknown_file_is_404(client):
+    c, _ = client
+    assert c.get("/audio/2").status_code == 404
@@ -0,0 +1,73 @@
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from mutagen.id3 import ID3, TPE1
+
+import api
+from backend.consolidate_music import analyze_files, create_db
+
+# Enough MPEG frame headers for mutagen to accept the file
+MP3_FRAMES = (b"\xff\xfb\x90\x64" + b"\0" * 413) * 20
+
+
+def tag_artist(path, artist):
+    tags = ID3()
+    tags.add(TPE1(encoding=3, text=artist))
+    tags.save(path)
+
+
+@pytest.fixture
+def library(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    song = src / "a.mp3"
+    song.write_bytes(MP3_FRAMES)
+    tag_artist(song, "Tagged")
+
+    db = str(tmp_path / "t.db")
+    create_db(db).close()
+    analyze_files(str(src), str(tmp_path), db)
+
+    def connect():
+        conn = sqlite3.connect(db, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    api.app.dependency_overrides[api.get_db] = connect
+    try:
+        yield src, song, db
+    finally:
+        api.app.dependency_overrides.pop(api.get_db, None)
+
+
+def stored_artist(db):
+    with sqlite3.connect(db) as conn:
+        return conn.execute("SELECT artist, artist_norm FROM files").fetchone()
+
+
+def edit_and_retag(db, song):
+    r = TestClient(api.app).patch("/files/1", json={"artist": "Edited"})
+    assert r.status_code == 200
+    assert stored_artist(db)[0] == "Edited"
+
+    # File changes on disk too, so the rescan re-reads its tags
+    tag_artist(song, "Retagged")
+
+
+def test_api_edit_survives_default_rescan(library):
+    src, song, db = library
+    edit_and_retag(db, song)
+
+    analyze_files(str(src), str(src.parent), db)
+
+    assert stored_artist(db) == ("Edited", "edited")
+
+
+def test_overwrite_rescan_replaces_edit(library):
+    src, song, db = library
+    edit_and_retag(db, song)
+
+    analyze_files(str(src), str(src.parent), db, no_overwrite=False)
+
+    assert stored_artist(db) == ("Retagged", "retagged")
@@ -0,0 +1,128 @@
+import json
+import os
+
+import pytest
+
+import api
+
+
+@pytest.fixture(autouse=True)
+def scan_dirs(tmp_path, monkeypatch):
+    jobs = tmp_path / "jobs"
+    jobs.mkdir()
+    monkeypatch.setattr(api, "SCAN_LOCK_PATH", str(tmp_path / "scan.lock"))
+    monkeypatch.setattr(api, "SCAN_JOBS_DIR", str(jobs))
+    return jobs
+
+
+def dead_pid():
+    # Above the kernel pid_max ceiling (2**22), so never a live process
+    return 2 ** 22 + 1
+
+
+def write_lock(pid):
+    with open(api.SCAN_LOCK_PATH, "w", encoding="utf-8") as f:
+        json.dump({"pid": pid}, f)
+
+
+def test_lock_is_exclusive_until_released():
+    assert api.acquire_scan_lock()
+    assert not api.acquire_scan_lock()
+
+    api.release_scan_lock()
+    assert api.acquire_scan_lock()
+
+
+def test_lock_held_by_dead_pid_is_taken_over():
+    write_lock(dead_pid())
+    assert api.acquire_scan_lock()
+
+    with open(api.SCAN_LOCK_PATH, encoding="utf-8") as f:
+        assert json.load(f)["pid"] == os.getpid()
+
+
+def test_job_ids_cannot_escape_jobs_dir():
+    assert api.load_scan_job("../scan") is None
+    assert api.load_scan_job("a/b") is None
+    assert api.load_scan_job("0" * 32) is None
+
+
+def test_successful_job_is_done_and_releases_lock(monkeypatch):
+    monkeypatch.setattr(api, "analyze_files", lambda **kw: {"ok": True})
+    monkeypatch.setattr(api, "save_last_run_plan", lambda plan: None)
+
+    assert api.acquire_scan_lock()
+    api.save_scan_job("job1", {"job_id": "job1", "state": "running"})
+
+    api.run_scan_job("job1", {}, dry_run=False)
+
+    job = api.load_scan_job("job1")
+    assert job["state"] == "done"
+    assert "finished_at" in job
+    assert not os.path.exists(api.SCAN_LOCK_PATH)
+
+
+def test_failed_job_records_error_and_releases_lock(monkeypatch):
+    def boom(**kw):
+        raise RuntimeError("disk gone")
+
+    monkeypatch.setattr(api, "analyze_files", boom)
+
+    assert api.acquire_scan_lock()
+    api.save_scan_job("job2", {"job_id": "job2", "state": "running"})
+
+    api.run_scan_job("job2", {}, dry_run=True)
+
+    job = api.load_scan_job("job2")
+    assert job["state"] == "error"
+    assert job["error"] == "DRY_RUN_FAILED"
+    assert job["details"] == "disk gone"
+    assert not os.path.exists(api.SCAN_LOCK_PATH)
+
+
+def test_recovery_fails_orphaned_jobs_and_clears_lock():
+    write_lock(dead_pid())
+    api.save_scan_job("orphan", {"state": "running", "pid": dead_pid()})
+    api.save_scan_job("done", {"state": "done", "pid": dead_pid()})
+
+    api.recover_scan_jobs()
+
+    assert api.load_scan_job("orphan")["state"] == "error"
+    assert api.load_scan_job("orphan")["error"] == "SCAN_INTERRUPTED"
+    assert api.load_scan_job("done")["state"] == "done"
+    assert not os.path.exists(api.SCAN_LOCK_PATH)
+
+
+def test_recovery_prunes_oldest_job_files(scan_dirs):
+    for i in range(5):
+        api.save_scan_job(f"job{i}", {"state": "done"})
+        os.utime(scan_dirs / f"job{i}.json", ns=(i, i))
+
+    api.recover_scan_jobs(keep=2)
+
+    assert sorted(os.listdir(scan_dirs)) == ["job3.json", "job4.json"]
+
+
+def test_lock_released_when_job_cannot_be_created(tmp_path, monkeypatch):
+    def disk_full(job_id, job):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(api, "set_active_db", lambda path: None)
+    monkeypatch.setattr(api, "save_scan_job", disk_full)
+
+    db = tmp_path / "t.db"
+    db.touch()
+    plan = {
+        "version": 1,
+        "layout": {},
+        "review": {"confirmed": True},
+        "database": {"db_path": str(db), "mode": "new"},
+        "paths": {"source": str(tmp_path), "target": str(tmp_path)},
+        "options": {"dry_run": True},
+    }
+
+    r = api.startup_run_scan(api.StartupRunScanPayload(plan=plan), api.BackgroundTasks())
+
+    assert r["status"] == "error"
+    assert r["error"] == "SCAN_START_FAILED"
+    assert not os.path.exists(api.SCAN_LOCK_PATH)
@@ -1,4 +1,5 @@
 from backend.normalization import normalize_text
+from backend.db_views import refresh_alias_pairs
 import sqlite3
 
 conn = sqlite3.connect("databases/full_knowledge.sqlite")
@@ -25,5 +26,8 @@ for r in rows:
         r[0],
     ))
 
+# Name signals read the norms just rewritten
+refresh_alias_pairs(c)
+
 conn.commit()
 conn.close()
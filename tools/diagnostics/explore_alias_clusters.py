@@ -1,5 +1,13 @@
 import sqlite3
-from collections import defaultdict, deque
+import sys
+from pathlib import Path
+
+# Ensure project root is on PYTHONPATH
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.cluster_service import build_duplicate_clusters
 
 DB_PATH = "databases/full_knowledge.sqlite"  # adjust if needed
 
@@ -7,38 +15,8 @@ conn = sqlite3.connect(DB_PATH)
 conn.row_factory = sqlite3.Row
 c = conn.cursor()
 
-edges = c.execute("""
-    SELECT file_id, other_file_id
-    FROM alias_strong_edges
-""").fetchall()
-
-graph = defaultdict(set)
-
-for r in edges:
-    graph[r["file_id"]].add(r["other_file_id"])
-    graph[r["other_file_id"]].add(r["file_id"])
-
-visited = set()
-clusters = []
-
-for node in graph:
-    if node in visited:
-        continue
-
-    cluster = set()
-    queue = deque([node])
-    visited.add(node)
-
-    while queue:
-        cur = queue.popleft()
-        cluster.add(cur)
-
-        for nbr in graph[cur]:
-            if nbr not in visited:
-                visited.add(nbr)
-                queue.append(nbr)
-
-    clusters.append(cluster)
+# Union-find straight over alias_strong_edges (no adjacency sets)
+clusters = list(build_duplicate_clusters(conn).values())
 
 # ---- Inspection ----
 clusters.sort(key=len, reverse=True)